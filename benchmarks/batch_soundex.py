@@ -0,0 +1,41 @@
+"""
+Compares per-word Soundex.transform() with the vectorized Soundex.transform_batch()
+
+    python -m benchmarks.batch_soundex [number of words]
+"""
+import random
+import sys
+import timeit
+
+from fonetika.soundex import RussianSoundex, EnglishSoundex, FinnishSoundex, EstonianSoundex, SwedenSoundex
+
+
+ALPHABETS = {
+    RussianSoundex: 'абвгдеёжзийклмнопрстуфхцчшщъыьэюя',
+    EnglishSoundex: 'abcdefghijklmnopqrstuvwxyz',
+    FinnishSoundex: 'abcdefghijklmnopqrstuvwxyzäö',
+    EstonianSoundex: 'abcdefghijklmnopqrsšzžtuvwõäöü',
+    SwedenSoundex: 'abcdefghijklmnopqrstuvwxyzåäö',
+}
+
+
+def random_words(alphabet, n):
+    return [''.join(random.choice(alphabet) for _ in range(random.randint(3, 14))) for _ in range(n)]
+
+
+def main(n=100000):
+    random.seed(0)
+    print(f'{"algorithm":<18}{"options":<12}{"transform, w/s":>16}{"batch, w/s":>14}{"speedup":>9}')
+    for cls, alphabet in ALPHABETS.items():
+        words = random_words(alphabet, n)
+        for options in ({}, {'code_vowels': True, 'cut_result': True}):
+            soundex = cls(**options)
+            assert soundex.transform_batch(words) == [soundex.transform(word) for word in words]
+            single = min(timeit.repeat(lambda: [soundex.transform(word) for word in words], number=1, repeat=3))
+            batch = min(timeit.repeat(lambda: soundex.transform_batch(words), number=1, repeat=3))
+            name = 'coded' if options else 'default'
+            print(f'{cls.__name__:<18}{name:<12}{n / single:>16.0f}{n / batch:>14.0f}{single / batch:>8.2f}x')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
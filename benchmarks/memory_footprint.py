@@ -0,0 +1,35 @@
+"""
+Measures memory held by every alive encoder object in a multi-tenant service
+
+    python -m benchmarks.memory_footprint [number of encoders]
+"""
+import sys
+import tracemalloc
+
+from fonetika.soundex import RussianSoundex, EnglishSoundex, FinnishSoundex
+from fonetika.metaphone import RussianMetaphone, EnglishMetaphone, FinnishMetaphone
+
+
+ENCODERS = [RussianSoundex, EnglishSoundex, FinnishSoundex, RussianMetaphone, EnglishMetaphone, FinnishMetaphone]
+
+
+def footprint(factory, n):
+    factory()
+    tracemalloc.start()
+    before = tracemalloc.take_snapshot()
+    encoders = [factory() for _ in range(n)]
+    encoders[0].transform('шварцнегер')
+    after = tracemalloc.take_snapshot()
+    tracemalloc.stop()
+    size = sum(stat.size_diff for stat in after.compare_to(before, 'filename'))
+    return (size - sys.getsizeof(encoders)) / n
+
+
+def main(n=5000):
+    print(f'{"algorithm":<20}{"bytes per object":>18}')
+    for cls in ENCODERS:
+        print(f'{cls.__name__:<20}{footprint(cls, n):>18.0f}')
+
+
+if __name__ == '__main__':
+    main(*map(int, sys.argv[1:]))
@@ -0,0 +1,142 @@
+"""
+Measures accuracy and throughput of every encoder/option/metric combination over labelled pairs of words
+
+    python -m benchmarks.pair_evaluation pairs.tsv [--encoder RussianMetaphone] [--max-distance 0 1 2] [--pareto]
+
+Every line of the file is "word1<TAB>word2<TAB>label", the label is 1 for matching and 0 for non-matching pairs.
+Configurations which are not worse in both F1 and words/sec than any other one are marked with "*"
+"""
+import argparse
+import itertools
+import time
+import tracemalloc
+
+from fonetika.distance import PhoneticsInnerLanguageDistance, PhoneticsWeightedDistance
+from fonetika.metaphone import RussianMetaphone, EnglishMetaphone, FinnishMetaphone, EstonianMetaphone, \
+    SwedenMetaphone
+from fonetika.soundex import RussianSoundex, EnglishSoundex, FinnishSoundex, EstonianSoundex, SwedenSoundex
+
+
+OPTIONS = {
+    RussianSoundex: ['code_vowels', 'reduce_phonemes', 'replace_ego_ogo_endings', 'delete_zeros'],
+    RussianMetaphone: ['reduce_phonemes', 'deaf_all_consonants', 'reduce_vowels', 'replace_ego_ogo_endings'],
+    EnglishSoundex: ['code_vowels', 'delete_zeros'],
+    EnglishMetaphone: ['reduce_vowels'],
+    FinnishSoundex: ['code_vowels', 'delete_zeros'],
+    FinnishMetaphone: [],
+    EstonianSoundex: ['code_vowels', 'delete_zeros'],
+    EstonianMetaphone: [],
+    SwedenSoundex: ['code_vowels', 'delete_zeros'],
+    SwedenMetaphone: [],
+}
+
+METRICS = {
+    'levenstein': PhoneticsInnerLanguageDistance,
+    'weighted': PhoneticsWeightedDistance,
+}
+
+
+def threshold(value):
+    value = float(value)
+    return int(value) if value.is_integer() else value
+
+
+def load_pairs(path):
+    pairs = []
+    with open(path, encoding='utf-8') as f:
+        for line in f:
+            line = line.rstrip('\n')
+            if not line or line.startswith('#'):
+                continue
+            word1, word2, label = line.split('\t')
+            pairs.append((word1, word2, label.strip() == '1'))
+    return pairs
+
+
+def configurations(classes):
+    for cls in classes:
+        names = OPTIONS[cls]
+        for values in itertools.product([False, True], repeat=len(names)):
+            yield cls, dict(zip(names, values))
+
+
+def throughput(phonetics, words):
+    start = time.perf_counter()
+    codes = phonetics.transform_many(words)
+    return dict(zip(words, codes)), len(words) / (time.perf_counter() - start)
+
+
+def peak_memory(cls, options, words):
+    tracemalloc.start()
+    cls(**options).transform_many(words)
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return peak
+
+
+def score(distance, codes, pairs, max_distance):
+    tp = fp = fn = 0
+    for word1, word2, label in pairs:
+        code1, code2 = distance.compared_code(codes[word1]), distance.compared_code(codes[word2])
+        predicted = distance.code_distance(code1, code2, max_distance) <= max_distance
+        tp += predicted and label
+        fp += predicted and not label
+        fn += label and not predicted
+    precision = tp / (tp + fp) if tp + fp else 0.0
+    recall = tp / (tp + fn) if tp + fn else 0.0
+    f1 = 2 * precision * recall / (precision + recall) if precision + recall else 0.0
+    return precision, recall, f1
+
+
+def pareto_front(rows):
+    return {
+        i for i, row in enumerate(rows)
+        if not any(other['f1'] >= row['f1'] and other['wps'] >= row['wps'] and
+                   (other['f1'] > row['f1'] or other['wps'] > row['wps']) for other in rows)
+    }
+
+
+def evaluate(pairs, classes, max_distances):
+    words = sorted({word for pair in pairs for word in pair[:2]})
+    rows = []
+    for cls, options in configurations(classes):
+        codes, wps = throughput(cls(**options), words)
+        memory = peak_memory(cls, options, words)
+        for metric_name, distance_cls in METRICS.items():
+            distance = distance_cls(cls(**options))
+            for max_distance in max_distances:
+                precision, recall, f1 = score(distance, codes, pairs, max_distance)
+                rows.append({
+                    'encoder': cls.__name__, 'options': ','.join(name for name, on in options.items() if on) or '-',
+                    'metric': metric_name, 'max_distance': max_distance, 'precision': precision, 'recall': recall,
+                    'f1': f1, 'wps': wps, 'memory': memory
+                })
+    return rows
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Accuracy vs throughput of phonetic encoders over labelled pairs')
+    parser.add_argument('pairs', help='file with "word1<TAB>word2<TAB>label" lines')
+    parser.add_argument('--encoder', action='append', choices=[cls.__name__ for cls in OPTIONS],
+                        help='algorithm class name, default is RussianSoundex and RussianMetaphone')
+    parser.add_argument('--max-distance', nargs='+', type=threshold, default=[0, 1, 2], help='distance thresholds')
+    parser.add_argument('--pareto', action='store_true', help='print only the Pareto front')
+    args = parser.parse_args(args)
+
+    classes = [cls for cls in OPTIONS if cls.__name__ in (args.encoder or ['RussianSoundex', 'RussianMetaphone'])]
+    rows = evaluate(load_pairs(args.pairs), classes, args.max_distance)
+    front = pareto_front(rows)
+
+    print(f'{"":<2}{"encoder":<18}{"metric":<12}{"dist":>5}{"prec":>7}{"recall":>7}{"f1":>7}'
+          f'{"words/s":>10}{"peak KB":>9}  options')
+    for i in sorted(range(len(rows)), key=lambda i: (-rows[i]['f1'], -rows[i]['wps'])):
+        if args.pareto and i not in front:
+            continue
+        row = rows[i]
+        print(f'{"*" if i in front else "":<2}{row["encoder"]:<18}{row["metric"]:<12}'
+              f'{row["max_distance"]:>5g}{row["precision"]:>7.3f}{row["recall"]:>7.3f}{row["f1"]:>7.3f}'
+              f'{row["wps"]:>10.0f}{row["memory"] / 1024:>9.0f}  {row["options"]}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,177 @@
+/*
+ * Optional compiled versions of hot loops of fonetika.
+ * Every function has a pure Python counterpart in fonetika/accel.py
+ * and must return exactly the same results.
+ */
+#define PY_SSIZE_T_CLEAN
+#include <Python.h>
+
+#define LATIN_CAPITAL_I_WITH_DOT 0x130
+
+
+static int
+check_str(PyObject *obj)
+{
+    if (!PyUnicode_Check(obj)) {
+        PyErr_Format(PyExc_TypeError, "str expected, got %.200s", Py_TYPE(obj)->tp_name);
+        return -1;
+    }
+    return 0;
+}
+
+
+static int
+is_word(Py_UCS4 ch)
+{
+    return Py_UNICODE_ISALNUM(ch) || ch == '_';
+}
+
+
+static PyObject *
+from_buffer(Py_UCS4 *buf, Py_ssize_t len)
+{
+    PyObject *result = PyUnicode_FromKindAndData(PyUnicode_4BYTE_KIND, buf, len);
+    PyMem_Free(buf);
+    return result;
+}
+
+
+/* Same as re.sub(r'(\w)(\1)+', r'\1', seq, flags=re.I) */
+static PyObject *
+reduce_seq(PyObject *self, PyObject *seq)
+{
+    if (check_str(seq) < 0)
+        return NULL;
+    Py_ssize_t n = PyUnicode_GET_LENGTH(seq), len = 0;
+    int kind = PyUnicode_KIND(seq);
+    const void *data = PyUnicode_DATA(seq);
+    Py_UCS4 *buf = PyMem_New(Py_UCS4, n ? n : 1);
+    if (buf == NULL)
+        return PyErr_NoMemory();
+
+    int in_run = 0;
+    Py_UCS4 run_lower = 0;
+    for (Py_ssize_t i = 0; i < n; i++) {
+        Py_UCS4 ch = PyUnicode_READ(kind, data, i);
+        Py_UCS4 lower = Py_UNICODE_TOLOWER(ch);
+        if (in_run && lower == run_lower)
+            continue;
+        buf[len++] = ch;
+        in_run = is_word(ch);
+        run_lower = lower;
+    }
+    if (len == n) {
+        PyMem_Free(buf);
+        Py_INCREF(seq);
+        return seq;
+    }
+    return from_buffer(buf, len);
+}
+
+
+/* Same as Metaphone._reduce_deaf_consonants_letters() */
+static PyObject *
+deaf_consonants(PyObject *self, PyObject *args)
+{
+    PyObject *word, *deaf_seq, *deaf_result, *criteria;
+    if (!PyArg_ParseTuple(args, "UUUU:deaf_consonants", &word, &deaf_seq, &deaf_result, &criteria))
+        return NULL;
+    Py_ssize_t n = PyUnicode_GET_LENGTH(word), n_deaf = PyUnicode_GET_LENGTH(deaf_seq);
+    Py_ssize_t n_criteria = PyUnicode_GET_LENGTH(criteria);
+    if (PyUnicode_GET_LENGTH(deaf_result) != n_deaf) {
+        PyErr_SetString(PyExc_ValueError, "deaf_seq and deaf_result should be the same length");
+        return NULL;
+    }
+    int kind = PyUnicode_KIND(word);
+    const void *data = PyUnicode_DATA(word);
+    Py_UCS4 *buf = PyMem_New(Py_UCS4, n ? n : 1);
+    if (buf == NULL)
+        return PyErr_NoMemory();
+
+    for (Py_ssize_t i = 0; i < n; i++) {
+        Py_UCS4 ch = PyUnicode_READ(kind, data, i);
+        Py_ssize_t idx = PyUnicode_FindChar(deaf_seq, ch, 0, n_deaf, 1);
+        if (idx >= 0) {
+            int voiced_next = 0;
+            if (i < n - 1) {
+                Py_UCS4 next = PyUnicode_READ(kind, data, i + 1);
+                /* str.lower() of the capital dotted I is two symbols, it is never a single criteria letter */
+                if (next != LATIN_CAPITAL_I_WITH_DOT)
+                    voiced_next = PyUnicode_FindChar(criteria, Py_UNICODE_TOLOWER(next), 0, n_criteria, 1) >= 0;
+            }
+            if (!voiced_next)
+                ch = PyUnicode_READ_CHAR(deaf_result, idx);
+        }
+        else if (idx == -2) {
+            PyMem_Free(buf);
+            return NULL;
+        }
+        buf[i] = ch;
+    }
+    return from_buffer(buf, n);
+}
+
+
+/* Same as ''.join('0' if letter in vowels else letter for letter in word) */
+static PyObject *
+translate_vowels(PyObject *self, PyObject *args)
+{
+    PyObject *word, *vowels;
+    if (!PyArg_ParseTuple(args, "UU:translate_vowels", &word, &vowels))
+        return NULL;
+    Py_ssize_t n = PyUnicode_GET_LENGTH(word), n_vowels = PyUnicode_GET_LENGTH(vowels);
+    int kind = PyUnicode_KIND(word);
+    const void *data = PyUnicode_DATA(word);
+    Py_UCS4 *buf = PyMem_New(Py_UCS4, n ? n : 1);
+    if (buf == NULL)
+        return PyErr_NoMemory();
+
+    for (Py_ssize_t i = 0; i < n; i++) {
+        Py_UCS4 ch = PyUnicode_READ(kind, data, i);
+        buf[i] = PyUnicode_FindChar(vowels, ch, 0, n_vowels, 1) >= 0 ? '0' : ch;
+    }
+    return from_buffer(buf, n);
+}
+
+
+/* Number of different symbols of two strings of the same length */
+static PyObject *
+hamming(PyObject *self, PyObject *args)
+{
+    PyObject *word1, *word2;
+    if (!PyArg_ParseTuple(args, "UU:hamming", &word1, &word2))
+        return NULL;
+    Py_ssize_t n = PyUnicode_GET_LENGTH(word1), dist = 0;
+    if (PyUnicode_GET_LENGTH(word2) != n) {
+        PyErr_SetString(PyExc_ValueError, "words should be the same length");
+        return NULL;
+    }
+    int kind1 = PyUnicode_KIND(word1), kind2 = PyUnicode_KIND(word2);
+    const void *data1 = PyUnicode_DATA(word1), *data2 = PyUnicode_DATA(word2);
+    for (Py_ssize_t i = 0; i < n; i++) {
+        if (PyUnicode_READ(kind1, data1, i) != PyUnicode_READ(kind2, data2, i))
+            dist++;
+    }
+    return PyLong_FromSsize_t(dist);
+}
+
+
+static PyMethodDef speedups_methods[] = {
+    {"reduce_seq", reduce_seq, METH_O, "Reduces several repeated symbols in a given string"},
+    {"deaf_consonants", deaf_consonants, METH_VARARGS, "Deafens consonants which are not followed by criteria letters"},
+    {"translate_vowels", translate_vowels, METH_VARARGS, "Replaces vowels with zeros"},
+    {"hamming", hamming, METH_VARARGS, "Hamming distance between strings of the same length"},
+    {NULL, NULL, 0, NULL}
+};
+
+
+static struct PyModuleDef speedups_module = {
+    PyModuleDef_HEAD_INIT, "fonetika._speedups", "Compiled accelerator of fonetika hot loops", -1, speedups_methods
+};
+
+
+PyMODINIT_FUNC
+PyInit__speedups(void)
+{
+    return PyModule_Create(&speedups_module);
+}
@@ -0,0 +1,53 @@
+"""
+Hot loops of the algorithms. The compiled accelerator (fonetika._speedups) is used
+if it was built, otherwise the pure Python implementations below are used.
+Set FONETIKA_NO_SPEEDUPS=1 to force the pure Python backend.
+The loops take a small share of the time of a word, most of it is spent in rule regexes,
+so the compiled backend makes whole words only about 1.2x faster for RussianMetaphone,
+1.05-1.1x for RussianSoundex and 2x for EnglishSoundex
+"""
+import os
+import re
+
+try:
+    if os.environ.get('FONETIKA_NO_SPEEDUPS'):
+        raise ImportError('compiled accelerator is disabled')
+    from . import _speedups
+except ImportError:
+    _speedups = None
+
+
+_reduce_regex = re.compile(r'(\w)(\1)+', re.I)
+
+
+def py_reduce_seq(seq):
+    return _reduce_regex.sub(r'\1', seq)
+
+
+def py_deaf_consonants(word, deaf_seq, deaf_result, criteria):
+    res = []
+    for i, letter in enumerate(word):
+        if letter in deaf_seq and (i == len(word) - 1 or word[i + 1].lower() not in criteria):
+            letter = deaf_result[deaf_seq.index(letter)]
+        res += [letter]
+    return ''.join(res)
+
+
+def py_translate_vowels(word, vowels):
+    return ''.join('0' if letter in vowels else letter for letter in word)
+
+
+def py_hamming(word1, word2):
+    if len(word1) != len(word2):
+        raise ValueError('words should be the same length')
+    return sum(a != b for a, b in zip(word1, word2))
+
+
+BACKEND = 'python' if _speedups is None else 'compiled'
+
+if _speedups is None:
+    reduce_seq, deaf_consonants = py_reduce_seq, py_deaf_consonants
+    translate_vowels, hamming = py_translate_vowels, py_hamming
+else:
+    reduce_seq, deaf_consonants = _speedups.reduce_seq, _speedups.deaf_consonants
+    translate_vowels, hamming = _speedups.translate_vowels, _speedups.hamming
@@ -1,23 +1,26 @@
-import re
-
 from abc import ABC, abstractmethod
+from ..accel import reduce_seq
+from ..bundle import active_bundle, pinned_bundle
 from ..config import CYRILLIC_SYMBOLS, LATIN_SYMBOLS
+from ..trace import traced
 
 
 class BasePhoneticsAlgorithm(ABC):
     _vowels = ''
-    __reduce_regex = re.compile(r'(\w)(\1)+', re.I)
+    _rule_set_class = None
     __cyrillic2latin_table = str.maketrans(CYRILLIC_SYMBOLS, LATIN_SYMBOLS)
     __latin2cyrillic_table = str.maketrans(LATIN_SYMBOLS, CYRILLIC_SYMBOLS)
 
+    @traced
     def _reduce_seq(self, seq):
         """
         Reduces several repeated symbols in a given string
         :param seq: string
         :return: reduced string
         """
-        return self.__reduce_regex.sub(r'\1', seq)
+        return reduce_seq(seq)
 
+    @traced
     def _cyrillic2latin(self, seq):
         """
         Converts all cyrillic letters into latin
@@ -26,6 +29,7 @@ class BasePhoneticsAlgorithm(ABC):
         """
         return seq.translate(self.__cyrillic2latin_table)
 
+    @traced
     def _latin2cyrillic(self, seq):
         """
         Converts all latin letters into cyrillic
@@ -34,6 +38,50 @@ class BasePhoneticsAlgorithm(ABC):
         """
         return seq.translate(self.__latin2cyrillic_table)
 
+    def _rule_set(self):
+        """
+        Rules are resolved once per word and passed to the stages, so all stages of a word use the same bundle
+        :return: an object of _rule_set_class from the active rule bundle, None if the algorithm has no rules
+        """
+        rule_set_class = self._rule_set_class
+        return None if rule_set_class is None else active_bundle().derive(rule_set_class, rule_set_class)
+
+    def get_config(self):
+        """
+        Describes an algorithm with its options, equal configs produce equal codes
+        :return: string like "RussianSoundex(code_vowels=True, ...)"
+        """
+        params = sorted(
+            (name.rsplit('__', 1)[-1].lstrip('_'), value) for name, value in vars(self).items()
+            if value is None or isinstance(value, (bool, int, float, str))
+        )
+        return '{}({})'.format(type(self).__name__, ', '.join(f'{name}={value!r}' for name, value in params))
+
+    def transform_many(self, words, policy=None, cache=None, metrics=None):
+        """
+        Converts a batch of words to phonetic codes, the whole batch is encoded by the same rule bundle
+        :param words: iterable of strings
+        :param policy: an InputPolicy object which guards every word, optional
+        :param cache: an EncodingCache object which is checked before encoding, optional
+        :param metrics: an EncodingMetrics object which counts encoded words, optional
+        :return: list of string codes
+        """
+        with pinned_bundle():
+            if cache is None:
+                if policy is None:
+                    transform = self.transform
+                else:
+                    def transform(word):
+                        return policy.transform(self, word)
+                if metrics is None:
+                    return [transform(word) for word in words]
+                return [metrics.observe(self, word, transform) for word in words]
+            if policy is None:
+                return cache.transform_many(self, words, metrics)
+            words = [policy.prepare(word) for word in words]
+            codes = iter(cache.transform_many(self, [word for word in words if word], metrics))
+            return [next(codes) if word else policy.skipped_code(word) for word in words]
+
     @abstractmethod
     def transform(self, word):
         """
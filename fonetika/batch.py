@@ -0,0 +1,116 @@
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+
+_ZERO = ord('0')
+_tables_cache = {}
+
+
+def _coding_table(soundex):
+    """
+    Lookup array which composes consonant and vowel translation of a Soundex class
+    """
+    key = (type(soundex), soundex.is_code_vowels())
+    if key not in _tables_cache:
+        if soundex.is_code_vowels():
+            vowels_table = soundex._vowels_table
+        else:
+            vowels_table = {ord(vowel): _ZERO for vowel in soundex.get_vowels()}
+        symbols = list(soundex._table.items()) + list(vowels_table.items())
+        size = max([code for pair in symbols for code in pair] + [_ZERO]) + 1
+        consonants, vowels = np.arange(size, dtype=np.uint32), np.arange(size, dtype=np.uint32)
+        for letter, code in soundex._table.items():
+            consonants[letter] = code
+        for letter, code in vowels_table.items():
+            vowels[letter] = code
+        _tables_cache[key] = vowels[consonants]
+    return _tables_cache[key]
+
+
+def _translate(codes, table):
+    size = len(table)
+    return np.where(codes < size, table[np.minimum(codes, size - 1)], codes)
+
+
+def _compact(codes, keep):
+    """
+    Moves kept symbols of every row to the left, the rest is filled with zero symbols
+    """
+    order = np.argsort(~keep, axis=1, kind='stable')
+    codes = np.take_along_axis(codes, order, axis=1)
+    lengths = keep.sum(axis=1)
+    codes[np.arange(codes.shape[1]) >= lengths[:, None]] = 0
+    return codes, lengths
+
+
+def _reduce_seq(codes, lengths):
+    """
+    Vectorized version of BasePhoneticsAlgorithm._reduce_seq: repeated word symbols
+    are collapsed case-insensitively
+    """
+    uniq, inverse = np.unique(codes, return_inverse=True)
+    is_word, lower = np.empty(len(uniq), dtype=bool), np.empty(len(uniq), dtype=np.uint32)
+    for i, code in enumerate(uniq.tolist()):
+        symbol = chr(code)
+        is_word[i] = symbol.isalnum() or symbol == '_'
+        lower[i] = ord(symbol.lower()) if len(symbol.lower()) == 1 else code
+    inverse = inverse.reshape(codes.shape)
+    is_word, lower = is_word[inverse], lower[inverse]
+
+    valid = np.arange(codes.shape[1]) < lengths[:, None]
+    repeated = np.zeros_like(valid)
+    repeated[:, 1:] = valid[:, 1:] & is_word[:, 1:] & is_word[:, :-1] & (lower[:, 1:] == lower[:, :-1])
+    return _compact(codes, valid & ~repeated)
+
+
+def _to_array(words):
+    width = max(max(map(len, words)), 1)
+    data = ''.join(word.ljust(width, '\0') for word in words).encode('utf-32-le')
+    codes = np.frombuffer(data, dtype=np.uint32).reshape(len(words), width).copy()
+    return codes, np.fromiter(map(len, words), dtype=np.int64, count=len(words))
+
+
+def _to_strings(codes, lengths):
+    data, width = codes.astype('<u4').tobytes(), codes.shape[1] * 4
+    return [data[i * width:i * width + length * 4].decode('utf-32-le') for i, length in enumerate(lengths.tolist())]
+
+
+def soundex_transform_batch(soundex, words):
+    """
+    Batch Soundex: language specific rules are applied per word, translation, reduction of repeated
+    symbols, removal of zeros and cutting/padding run vectorized over a 2D array of code points
+    :param soundex: an object of Soundex class
+    :param words: list of strings
+    :return: list of string codes, the same as soundex.transform() returns
+    """
+    if np is None:
+        raise ImportError('numpy is required for batch Soundex, install it with "pip install numpy"')
+    rule_set = soundex._rule_set()
+    words = [soundex._preprocess(word, rule_set).lower() for word in words]
+    if not words:
+        return []
+
+    codes, lengths = _to_array(words)
+    codes = _translate(codes, _coding_table(soundex))
+    if soundex.is_reduce_word():
+        codes, lengths = _reduce_seq(codes, lengths)
+    if soundex.is_delete_zeros():
+        codes, lengths = _compact(codes, (codes != _ZERO) & (np.arange(codes.shape[1]) < lengths[:, None]))
+        codes, lengths = _reduce_seq(codes, lengths)
+    if soundex.is_cut_result():
+        size = soundex.get_seq_cutted_len()
+        if codes.shape[1] < size:
+            codes = np.pad(codes, ((0, 0), (0, size - codes.shape[1])))
+        codes = codes[:, :size]
+        codes[np.arange(size) >= lengths[:, None]] = _ZERO
+        lengths = np.full_like(lengths, size)
+    if soundex.is_delete_first_coded_letter():
+        codes, lengths = codes[:, 1:], np.maximum(lengths - 1, 0)
+
+    delete_first_letter = soundex.is_delete_first_letter()
+    return [
+        '' if not word else ('' if delete_first_letter else word[0].capitalize()) + code.upper()
+        for word, code in zip(words, _to_strings(codes, lengths))
+    ]
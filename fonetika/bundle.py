@@ -0,0 +1,233 @@
+import contextlib
+import contextvars
+import hashlib
+import json
+import re
+
+from . import config
+
+
+BUNDLE_FORMAT = 1
+
+# values which are not regexes, but are bound to rules of a bundle
+BUNDLED_VALUES = ('EN_METAPHONE_PASSES',)
+
+
+class RuleBundleException(Exception):
+    def __init__(self, msg):
+        self.msg = msg
+
+
+def _is_rule_list(value):
+    return isinstance(value, (list, tuple)) and bool(value) and all(
+        isinstance(rule, tuple) and len(rule) == 2 and hasattr(rule[0], 'pattern') for rule in value
+    )
+
+
+def _config_sources():
+    """
+    :return: dict name -> source of every rule of the config module
+    """
+    sources = {}
+    for name in dir(config):
+        if not name.isupper():
+            continue
+        value = getattr(config, name)
+        if _is_rule_list(value):
+            sources[name] = [(rule.pattern, rule.flags, result) for rule, result in value]
+        elif isinstance(value, re.Pattern):
+            sources[name] = (value.pattern, value.flags)
+        elif name in BUNDLED_VALUES:
+            sources[name] = tuple(value)
+    return sources
+
+
+def _digest(sources):
+    """
+    Version hash of the given rules together with all other tables of the config module
+    """
+    values = dict(sources)
+    for name in dir(config):
+        if name.isupper() and name not in values:
+            value = getattr(config, name)
+            values[name] = sorted(value) if isinstance(value, frozenset) else value
+    digest = hashlib.sha1()
+    for name in sorted(values):
+        digest.update(f'{name}={values[name]!r};'.encode('utf-8'))
+    return digest.hexdigest()[:16]
+
+
+class RuleBundle:
+    """
+    Immutable versioned set of transcription rules of all languages.
+    Rules are kept as sources and every rule list is compiled on its first use,
+    so loading a bundle doesn't compile regexes of languages which are not used
+    """
+    def __init__(self, sources, compiled=None):
+        """
+        Init a bundle
+        :param sources: dict name -> list of (pattern, flags, replacement) for substitution rules,
+            (pattern, flags) for single regexes or a tuple for other bundled values
+        :param compiled: dict name -> already compiled rules, optional
+        """
+        self.__sources = sources
+        self.__compiled = dict(compiled or {})
+        self.__derived = {}
+        self.version = _digest(sources)
+
+    @classmethod
+    def from_config(cls):
+        """
+        :return: bundle of rules of the config module, compiled regexes are reused
+        """
+        sources = _config_sources()
+        return cls(sources, {name: tuple(getattr(config, name)) if isinstance(sources[name], list)
+                             else getattr(config, name) for name in sources})
+
+    def __compile(self, name):
+        source = self.__sources[name]
+        if isinstance(source, list):
+            return tuple((re.compile(pattern, flags), result) for pattern, flags, result in source)
+        if name in BUNDLED_VALUES:
+            return source
+        return re.compile(*source)
+
+    def __getitem__(self, name):
+        compiled = self.__compiled.get(name)
+        if compiled is None:
+            compiled = self.__compiled[name] = self.__compile(name)
+        return compiled
+
+    def names(self):
+        return sorted(self.__sources)
+
+    def is_shipped(self, *names):
+        """
+        :param names: names of rules
+        :return: True if the rules are the same as the rules of the config module
+        """
+        return all(self.__sources.get(name) == _shipped_sources.get(name) for name in names)
+
+    def derive(self, key, factory):
+        """
+        Caches a value computed from rules of the bundle
+        :param key: name of the value or a class, e.g. a RuleSet subclass
+        :param factory: function of the bundle
+        :return: value
+        """
+        value = self.__derived.get(key)
+        if value is None:
+            value = self.__derived[key] = factory(self)
+        return value
+
+    def replace(self, **rules):
+        """
+        Makes a new bundle with some rules replaced, e.g. for a regional dialect
+        :param rules: name -> list of (compiled regex, replacement) pairs, a compiled regex or a tuple
+        :return: RuleBundle object
+        """
+        sources = dict(self.__sources)
+        for name, value in rules.items():
+            if name not in sources:
+                raise RuleBundleException(f'Unknown rules {name}!')
+            if isinstance(sources[name], list):
+                sources[name] = [(rule.pattern, rule.flags, result) for rule, result in value]
+            elif name in BUNDLED_VALUES:
+                sources[name] = tuple(value)
+            else:
+                sources[name] = (value.pattern, value.flags)
+        return RuleBundle(sources)
+
+    def export(self, path):
+        """
+        Writes the bundle to a file
+        :param path: output file
+        """
+        rules = {}
+        for name, source in sorted(self.__sources.items()):
+            if isinstance(source, list):
+                rules[name] = {'rules': [list(rule) for rule in source]}
+            elif name in BUNDLED_VALUES:
+                rules[name] = {'value': list(source)}
+            else:
+                rules[name] = {'regex': list(source)}
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump({'format': BUNDLE_FORMAT, 'version': self.version, 'rules': rules}, f, ensure_ascii=False,
+                      indent=1)
+
+    @classmethod
+    def load(cls, path):
+        """
+        Reads a bundle written by export(), rules which are absent in the file are taken from the config module
+        :param path: bundle file
+        :return: RuleBundle object
+        """
+        with open(path, encoding='utf-8') as f:
+            data = json.load(f)
+        if data.get('format') != BUNDLE_FORMAT:
+            raise RuleBundleException(f'{path} is not a rule bundle of format {BUNDLE_FORMAT}!')
+        sources = _config_sources()
+        for name, value in data['rules'].items():
+            if name not in sources:
+                raise RuleBundleException(f'{path} contains unknown rules {name}!')
+            if 'rules' in value:
+                sources[name] = [(pattern, flags, result) for pattern, flags, result in value['rules']]
+            elif 'value' in value:
+                sources[name] = tuple(value['value'])
+            else:
+                sources[name] = tuple(value['regex'])
+        bundle = cls(sources)
+        if data.get('version', bundle.version) != bundle.version:
+            raise RuleBundleException(f'{path} is corrupted or was exported by another version of tables!')
+        return bundle
+
+
+_shipped_sources = _config_sources()
+_active_bundle = RuleBundle.from_config()
+_pinned_bundle = contextvars.ContextVar('fonetika_rule_bundle', default=None)
+
+
+def active_bundle():
+    """
+    :return: bundle pinned in the current context or the globally active bundle
+    """
+    return _pinned_bundle.get() or _active_bundle
+
+
+def activate_bundle(bundle):
+    """
+    Atomically replaces the globally active bundle, calls inside pinned_bundle() keep using the old one
+    :param bundle: RuleBundle object
+    :return: previous bundle
+    """
+    global _active_bundle
+    assert isinstance(bundle, RuleBundle)
+    previous, _active_bundle = _active_bundle, bundle
+    return previous
+
+
+def reload_bundle(path):
+    """
+    Loads a bundle from a file and activates it
+    :param path: bundle file
+    :return: previous bundle
+    """
+    return activate_bundle(RuleBundle.load(path))
+
+
+@contextlib.contextmanager
+def pinned_bundle():
+    """
+    Pins the active bundle for a batch, so all words of the batch are encoded by the same rules
+    """
+    bundle = _pinned_bundle.get()
+    if bundle is not None:
+        yield bundle
+        return
+    bundle = _active_bundle
+    token = _pinned_bundle.set(bundle)
+    try:
+        yield bundle
+    finally:
+        _pinned_bundle.reset(token)
+
@@ -0,0 +1,95 @@
+import sqlite3
+
+from .base.base import BasePhoneticsAlgorithm
+from .ruleset import rules_version
+
+
+class EncodingCache:
+    """
+    Persistent word->code cache in an SQLite file, shared between batch runs.
+    Codes are keyed by the algorithm config and the rules version, so codes
+    produced by outdated rules are never returned and are removed on open
+    """
+    _chunk_size = 500
+
+    def __init__(self, path, phonetics):
+        """
+        Open a cache
+        :param path: SQLite file, created if it doesn't exist
+        :param phonetics: an object of BasePhoneticsAlgorithm class
+        """
+        assert isinstance(phonetics, BasePhoneticsAlgorithm)
+        self.path = path
+        self.config = phonetics.get_config()
+        self.__conn = sqlite3.connect(path)
+        with self.__conn:
+            self.__conn.execute(
+                'CREATE TABLE IF NOT EXISTS codes '
+                '(config TEXT, version TEXT, word TEXT, code TEXT, PRIMARY KEY (config, word))'
+            )
+            self.__conn.execute('DELETE FROM codes WHERE config = ? AND version != ?', (self.config, rules_version()))
+
+    def get_many(self, words):
+        """
+        :param words: iterable of strings
+        :return: dict of cached codes
+        """
+        words, result = list(set(words)), {}
+        for i in range(0, len(words), self._chunk_size):
+            chunk = words[i:i + self._chunk_size]
+            rows = self.__conn.execute(
+                f'SELECT word, code FROM codes WHERE config = ? AND version = ? '
+                f'AND word IN ({", ".join("?" * len(chunk))})',
+                [self.config, rules_version()] + chunk
+            )
+            result.update(rows)
+        return result
+
+    def put_many(self, codes):
+        """
+        :param codes: iterable of (word, code) pairs
+        """
+        version = rules_version()
+        with self.__conn:
+            self.__conn.executemany(
+                'INSERT OR REPLACE INTO codes VALUES (?, ?, ?, ?)',
+                ((self.config, version, word, code) for word, code in codes)
+            )
+
+    def transform_many(self, phonetics, words, metrics=None):
+        """
+        Converts a batch of words taking known codes from the cache and storing new ones
+        :param phonetics: an object of BasePhoneticsAlgorithm class with the same config as the cache
+        :param words: iterable of strings
+        :param metrics: an EncodingMetrics object which counts words and cache hits, optional
+        :return: list of string codes
+        """
+        assert phonetics.get_config() == self.config
+        words = list(words)
+        codes = self.get_many(words)
+        new_codes = {}
+        for word in words:
+            if word not in codes:
+                if metrics is None:
+                    codes[word] = new_codes[word] = phonetics.transform(word)
+                else:
+                    codes[word] = new_codes[word] = metrics.observe(phonetics, word, phonetics.transform)
+        if metrics is not None:
+            metrics.count_misses(len(new_codes))
+            metrics.count_hits(phonetics, len(words) - len(new_codes))
+        if new_codes:
+            self.put_many(new_codes.items())
+        return [codes[word] for word in words]
+
+    def __len__(self):
+        query = 'SELECT COUNT(*) FROM codes WHERE config = ? AND version = ?'
+        return self.__conn.execute(query, (self.config, rules_version())).fetchone()[0]
+
+    def close(self):
+        self.__conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
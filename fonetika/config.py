@@ -26,6 +26,16 @@ RU_EGO_OGO_ENDING = re.compile(r'([ео])(г)(о$)', re.I)
 RU_IA_ENDING = re.compile(r'[еи][ая]', re.I)
 RU_II_ENDING = re.compile(r'и[еио]', re.I)
 
+# Closed-class "-его/-ого" words with the same first parse of pymorphy2: ADJF, NUMB or NPRO and other tags
+RU_EGO_OGO_FORMS = frozenset([
+    'его', 'него', 'сего', 'того', 'этого', 'чего', 'кого', 'никого', 'всего', 'моего', 'твоего',
+    'своего', 'нашего', 'вашего', 'чьего', 'самого', 'одного', 'какого', 'такого', 'которого', 'другого',
+    'многого', 'иного', 'любого', 'каждого'
+])
+RU_NOT_EGO_OGO_FORMS = frozenset([
+    'ничего', 'много', 'немного', 'премного', 'итого', 'дорого', 'недорого', 'строго', 'нестрого'
+])
+
 EN_REMOVE_MAP = [
     (re.compile(r'[hw]', re.I), '')
 ]
@@ -62,6 +72,10 @@ EN_METAPHONE_PHONEMES = [
     (re.compile(rf'(w)([^{EN_VOWELS}])', re.I), r'\2')
 ]
 
+# Sizes of groups of consecutive EN_METAPHONE_PHONEMES rules which don't interact and may be applied in one pass,
+# should be revalidated (tests/test_algo.py) whenever the rules are changed
+EN_METAPHONE_PASSES = (13, 3, 2, 1)
+
 EN_VOWELS_TO_REMOVE = [(re.compile(rf'[{EN_VOWELS}]', re.I), '')]
 
 EE_PHONEMES = [
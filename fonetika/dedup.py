@@ -0,0 +1,149 @@
+import heapq
+import os
+import tempfile
+
+from collections import deque
+from itertools import islice
+
+from .base.base import BasePhoneticsAlgorithm
+from .bundle import pinned_bundle
+from .distance import PhoneticsInnerLanguageDistance
+
+
+class _UnionFind:
+    """
+    Sparse disjoint sets over record ids, only ids of found duplicates are stored,
+    the root of a set is its smallest id
+    """
+    def __init__(self):
+        self.parent = {}
+
+    def find(self, idx):
+        parent = self.parent
+        root = idx
+        while parent.get(root, root) != root:
+            root = parent[root]
+        while idx != root:
+            parent[idx], idx = root, parent[idx]
+        return root
+
+    def union(self, idx1, idx2):
+        root1, root2 = self.find(idx1), self.find(idx2)
+        if root1 == root2:
+            return False
+        if root1 > root2:
+            root1, root2 = root2, root1
+        self.parent[root2] = root1
+        self.parent.setdefault(root1, root1)
+        return True
+
+
+class SortedNeighbourhood:
+    """
+    Sorted neighbourhood deduplication: records are sorted by phonetic keys with an external merge sort
+    (sorted chunks are spilled to disk), then every record is compared only with the previous window - 1 records
+    """
+    def __init__(self, keys, distance=None, max_distance=1, window=10, chunk_size=1000000, tmp_dir=None):
+        """
+        Init a deduplication operator
+        :param keys: list of objects of BasePhoneticsAlgorithm class, records are sorted by their codes in this order
+        :param distance: an object of PhoneticsInnerLanguageDistance class which compares neighbours,
+            default is Levenstein distance of codes of the last key
+        :param max_distance: neighbours within this distance are duplicates
+        :param window: size of the sliding window
+        :param chunk_size: number of records sorted in memory, larger inputs are spilled to disk
+        :param tmp_dir: directory for spilled chunks, optional
+        """
+        assert keys and all(isinstance(key, BasePhoneticsAlgorithm) for key in keys)
+        assert distance is None or isinstance(distance, PhoneticsInnerLanguageDistance)
+        assert window > 1 and chunk_size > 0
+        self.keys = list(keys)
+        self.distance = distance or PhoneticsInnerLanguageDistance(self.keys[-1])
+        self.max_distance = max_distance
+        self.window = window
+        self.chunk_size = chunk_size
+        self.tmp_dir = tmp_dir
+        self.__stats = {}
+
+    def __sorted_chunk(self, idx, words):
+        # tabs and line breaks are field and record separators of spilled chunks
+        words = [word.replace('\t', ' ').replace('\n', ' ') for word in words]
+        columns = [key.transform_many(words) for key in self.keys]
+        key_idx = next((i for i, key in enumerate(self.keys) if key is self.distance.phonetics), None)
+        if key_idx is None:
+            columns.append([self.distance.code(word) for word in words])
+        else:
+            columns.append([self.distance.compared_code(code) for code in columns[key_idx]])
+        lines = ['\t'.join(fields) + f'\t{i}\n' for i, fields in enumerate(zip(*columns), idx)]
+        lines.sort()
+        return lines
+
+    def __spill(self, lines, tmp_dir):
+        fd, path = tempfile.mkstemp(suffix='.chunk', dir=tmp_dir)
+        with os.fdopen(fd, 'w', encoding='utf-8', newline='\n') as f:
+            f.writelines(lines)
+        self.__stats['spills'] += 1
+        return path
+
+    def __sorted_records(self, words, tmp_dir):
+        """
+        External merge sort of records, yields pairs (comparison code, record id)
+        """
+        words = iter(words)
+        paths, lines, count = [], [], 0
+        while True:
+            chunk = list(islice(words, self.chunk_size))
+            if not chunk:
+                break
+            if lines:
+                paths.append(self.__spill(lines, tmp_dir))
+            lines = self.__sorted_chunk(count, chunk)
+            count += len(chunk)
+        self.__stats['records'] = count
+
+        if paths:
+            paths.append(self.__spill(lines, tmp_dir))
+            # only '\n' ends a record, other line breaks may come from codes
+            files = [open(path, encoding='utf-8', newline='\n') for path in paths]
+            try:
+                lines = heapq.merge(*files)
+                for line in lines:
+                    yield self.__parse(line)
+            finally:
+                for f in files:
+                    f.close()
+        else:
+            for line in lines:
+                yield self.__parse(line)
+
+    @staticmethod
+    def __parse(line):
+        fields = line.rstrip('\n').rsplit('\t', 2)
+        return fields[-2], int(fields[-1])
+
+    def clusters(self, words):
+        """
+        Finds duplicates in a corpus
+        :param words: iterable of strings, may be larger than memory
+        :return: generator of cluster ids in the order of words, the cluster id is the index of its first word
+        """
+        self.__stats = {'records': 0, 'spills': 0, 'comparisons': 0, 'duplicates': 0}
+        sets = _UnionFind()
+        with pinned_bundle(), tempfile.TemporaryDirectory(dir=self.tmp_dir) as tmp_dir:
+            window = deque(maxlen=self.window - 1)
+            for code, idx in self.__sorted_records(words, tmp_dir):
+                for other_code, other_idx in window:
+                    self.__stats['comparisons'] += 1
+                    if self.distance.code_distance(code, other_code, self.max_distance) <= self.max_distance:
+                        if sets.union(idx, other_idx):
+                            self.__stats['duplicates'] += 1
+                window.append((code, idx))
+
+        for idx in range(self.__stats['records']):
+            yield sets.find(idx)
+
+    def get_stats(self):
+        """
+        :return: dict with counters of the last run
+        """
+        return dict(self.__stats)
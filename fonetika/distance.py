@@ -1,11 +1,20 @@
 import editdistance
 
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
 from abc import abstractmethod
 
+from .accel import hamming
 from .base.base import BasePhoneticsAlgorithm
 from .metaphone import Metaphone
 from .soundex import Soundex
 
+# native early-exit check "distance <= threshold", absent in old editdistance versions
+_eval_criterion = getattr(editdistance, 'eval_criterion', None)
+
 
 class PhoneticDistanceException(Exception):
     def __init__(self, msg):
@@ -17,24 +26,98 @@ class PhoneticsDistance:
     def _hamming(word1, word2):
         if len(word1) != len(word2):
             raise PhoneticDistanceException('For Hamming distance words should be the same length!')
+        if isinstance(word1, str) and isinstance(word2, str):
+            return hamming(word1, word2)
         return sum(a != b for a, b in zip(word1, word2))
 
     @staticmethod
     def _levenstein(word1, word2):
         return editdistance.eval(word1, word2)
 
+    @staticmethod
+    def _bounded_hamming(word1, word2, max_distance):
+        if len(word1) != len(word2):
+            raise PhoneticDistanceException('For Hamming distance words should be the same length!')
+        dist = 0
+        for a, b in zip(word1, word2):
+            if a != b:
+                dist += 1
+                if dist > max_distance:
+                    break
+        return dist
+
+    @staticmethod
+    def _banded_levenstein(word1, word2, max_distance):
+        """
+        Levenstein distance computed only inside the diagonal band of width max_distance,
+        stops as soon as a whole row exceeds the bound
+        """
+        if len(word1) > len(word2):
+            word1, word2 = word2, word1
+        # distances are integers, so a float bound is floored for the band
+        band = int(max_distance)
+        n, m, overflow = len(word1), len(word2), max_distance + 1
+        prev = [j if j <= band else overflow for j in range(m + 1)]
+        for i in range(1, n + 1):
+            cur = [overflow] * (m + 1)
+            cur[0] = row_min = i if i <= band else overflow
+            letter = word1[i - 1]
+            for j in range(max(1, i - band), min(m, i + band) + 1):
+                value = min(prev[j - 1] + (letter != word2[j - 1]), prev[j] + 1, cur[j - 1] + 1, overflow)
+                cur[j] = value
+                if value < row_min:
+                    row_min = value
+            if row_min > band:
+                return overflow
+            prev = cur
+        return prev[m]
+
+    @staticmethod
+    def _bounded_levenstein(word1, word2, max_distance):
+        if word1 == word2:
+            return 0
+        if abs(len(word1) - len(word2)) > max_distance or not max_distance:
+            return max_distance + 1
+        if _eval_criterion is None:
+            return PhoneticsDistance._banded_levenstein(word1, word2, max_distance)
+        if not _eval_criterion(word1, word2, int(max_distance)):
+            return max_distance + 1
+        return editdistance.eval(word1, word2)
+
     _distance_metric = {
         'levenstein': _levenstein.__func__,
         'hamming': _hamming.__func__,
     }
 
+    _bounded_distance_metric = {
+        'levenstein': _bounded_levenstein.__func__,
+        'hamming': _bounded_hamming.__func__,
+    }
+
+    def _init_metrics(self, metric_name, metrics):
+        assert metric_name in self._distance_metric.keys()
+        if not metrics:
+            self.metrics = self._distance_metric[metric_name]
+            self.bounded_metrics = self._bounded_distance_metric[metric_name]
+        else:
+            self.metrics = metrics
+            self.bounded_metrics = None
+
+    def _compare(self, code1, code2, max_distance=None):
+        if max_distance is None:
+            return self.metrics(code1, code2)
+        if self.bounded_metrics is not None:
+            return self.bounded_metrics(code1, code2, max_distance)
+        return min(self.metrics(code1, code2), max_distance + 1)
+
     @abstractmethod
-    def distance(self, word1, word2):
+    def distance(self, word1, word2, max_distance=None):
         """
         Compute the distance between phonetics codes
         :param word1: first original word
         :param word2: second original word
-        :return: distance value
+        :param max_distance: stop as soon as the distance exceeds this bound, optional
+        :return: distance value, max_distance + 1 if the bound is exceeded
         """
         return None
 
@@ -48,25 +131,46 @@ class PhoneticsInnerLanguageDistance(PhoneticsDistance):
         :param metrics: another distance function, optional
         """
         assert isinstance(phonetics, BasePhoneticsAlgorithm)
-        assert metric_name in self._distance_metric.keys()
         self.phonetics = phonetics
+        self._init_metrics(metric_name, metrics)
 
-        if not metrics:
-            self.metrics = self._distance_metric[metric_name]
-        else:
-            self.metrics = metrics
-
-    def distance(self, word1, word2):
+    def distance(self, word1, word2, max_distance=None):
         """
         Compute the distance between phonetics codes
         :param word1: first original word
         :param word2: second original word
-        :return: distance value
+        :param max_distance: stop as soon as the distance exceeds this bound, optional
+        :return: distance value, max_distance + 1 if the bound is exceeded
+        """
+        return self._compare(self.code(word1), self.code(word2), max_distance)
+
+    def code(self, word):
+        """
+        Phonetic code of a word in the form which is compared by the distance
+        :param word: original word
+        :return: string code
+        """
+        return self.compared_code(self.phonetics.transform(word))
+
+    def compared_code(self, code):
+        """
+        Converts a code of the phonetics algorithm to the form which is compared by the distance
+        :param code: string code returned by transform() of the algorithm
+        :return: string code
+        """
+        if isinstance(self.phonetics, Soundex) and not self.phonetics.is_delete_first_letter():
+            return code[1:]
+        return code
+
+    def code_distance(self, code1, code2, max_distance=None):
+        """
+        Compute the distance between codes returned by code()
+        :param code1: first code
+        :param code2: second code
+        :param max_distance: stop as soon as the distance exceeds this bound, optional
+        :return: distance value, max_distance + 1 if the bound is exceeded
         """
-        w1, w2 = self.phonetics.transform(word1), self.phonetics.transform(word2)
-        if isinstance(self.phonetics, Soundex):
-            return self.metrics(w1, w2) if self.phonetics.is_delete_first_letter() else self.metrics(w1[1:], w2[1:])
-        return self.metrics(w1, w2)
+        return self._compare(code1, code2, max_distance)
 
 
 class PhoneticsBetweenLanguagesDistance(PhoneticsDistance):
@@ -80,26 +184,174 @@ class PhoneticsBetweenLanguagesDistance(PhoneticsDistance):
         """
         assert (isinstance(phonetics1, Soundex) and isinstance(phonetics2, Soundex) or
                 isinstance(phonetics1, Metaphone) and isinstance(phonetics2, Metaphone))
-        assert metric_name in self._distance_metric.keys()
         self.phonetics1 = phonetics1
         self.phonetics2 = phonetics2
+        self._init_metrics(metric_name, metrics)
 
-        if not metrics:
-            self.metrics = self._distance_metric[metric_name]
-        else:
-            self.metrics = metrics
-
-    def distance(self, word1, word2):
+    def distance(self, word1, word2, max_distance=None):
         """
         Compute the distance between phonetics codes
         :param word1: first original word
         :param word2: second original word
-        :return: distance value
+        :param max_distance: stop as soon as the distance exceeds this bound, optional
+        :return: distance value, max_distance + 1 if the bound is exceeded
         """
         w1, w2 = self.phonetics1.transform(word1), self.phonetics2.transform(word2)
         if isinstance(self.phonetics1, Soundex) and isinstance(self.phonetics2, Soundex):
-            if self.phonetics1.is_delete_first_letter() and self.phonetics2.is_delete_first_letter():
-                return self.metrics(w1, w2)
+            if not (self.phonetics1.is_delete_first_letter() and self.phonetics2.is_delete_first_letter()):
+                w1, w2 = w1[1:], w2[1:]
+        return self._compare(w1, w2, max_distance)
+
+
+class SubstitutionCosts:
+    """
+    Dense matrix of substitution costs between symbols of phonetic codes
+    """
+    # smaller batches are scored by the pure Python loop
+    _vectorize_from = 16
+
+    def __init__(self, alphabet, costs, indel_cost=1.0, default_cost=1.0):
+        """
+        Init a cost matrix
+        :param alphabet: symbols of codes
+        :param costs: dict {(symbol1, symbol2): cost}, symmetric costs may be given once
+        :param indel_cost: cost of insertion or deletion of a symbol
+        :param default_cost: cost of substitution of symbols which are not in costs
+        """
+        self.alphabet = ''.join(dict.fromkeys(alphabet))
+        self.indel_cost = indel_cost
+        self.__index = {symbol: i for i, symbol in enumerate(self.alphabet)}
+        size = len(self.alphabet) + 1
+        self.__matrix = [[default_cost] * size for _ in range(size)]
+        for i in range(size - 1):
+            self.__matrix[i][i] = 0.0
+        for (symbol1, symbol2), cost in costs.items():
+            i, j = self.__index[symbol1], self.__index[symbol2]
+            self.__matrix[i][j] = self.__matrix[j][i] = cost
+        self.__array = None
+
+    @classmethod
+    def for_algorithm(cls, phonetics, vowel_cost=0.5, neighbour_cost=0.75):
+        """
+        Derives costs from coding tables of an algorithm: different vowel classes are cheaper than
+        other substitutions, and so are adjacent Soundex groups (the tables enumerate consonant groups
+        by place of articulation, e.g. 1=б/п, 2=в/ф) and voiced/voiceless Metaphone pairs
+        :param phonetics: an object of Soundex or Metaphone class
+        :param vowel_cost: cost of substitution of vowel codes
+        :param neighbour_cost: cost of substitution of related consonant codes
+        :return: SubstitutionCosts object
+        """
+        if isinstance(phonetics, Soundex):
+            if phonetics.is_code_vowels():
+                vowels = ''.join(chr(code) for code in phonetics._vowels_table.values())
             else:
-                return self.metrics(w1[1:], w2[1:])
-        return self.metrics(w1, w2)
+                vowels = '0'
+            consonants = sorted({chr(code) for code in phonetics._table.values()})
+            neighbours = [(a, b) for a, b in zip(consonants, consonants[1:])
+                          if a.isdigit() and b.isdigit() and int(b) - int(a) == 1]
+        elif isinstance(phonetics, Metaphone):
+            vowels = ''.join(chr(code) for code in phonetics._vowels_table.values()).upper()
+            neighbours = [(chr(voiced).upper(), chr(deaf).upper()) for voiced, deaf in phonetics._deaf_consonants.items()]
+            consonants = [symbol for pair in neighbours for symbol in pair]
+        else:
+            raise PhoneticDistanceException('Costs can be derived only for Soundex and Metaphone algorithms!')
+
+        vowels = ''.join(dict.fromkeys(vowels))
+        costs = {(a, b): vowel_cost for a in vowels for b in vowels if a != b}
+        costs.update({pair: neighbour_cost for pair in neighbours})
+        return cls(vowels + ''.join(consonants), costs)
+
+    def cost(self, symbol1, symbol2):
+        """
+        :return: substitution cost of two symbols
+        """
+        if symbol1 == symbol2:
+            return 0.0
+        other = len(self.alphabet)
+        return self.__matrix[self.__index.get(symbol1, other)][self.__index.get(symbol2, other)]
+
+    def distance(self, code1, code2, max_distance=None):
+        """
+        Weighted edit distance between two codes
+        :param code1: first code
+        :param code2: second code
+        :param max_distance: stop as soon as the distance exceeds this bound, optional
+        :return: distance value, max_distance + 1 if the bound is exceeded
+        """
+        matrix, index, indel, other = self.__matrix, self.__index, self.indel_cost, len(self.alphabet)
+        columns = [index.get(symbol, other) for symbol in code2]
+        prev = [j * indel for j in range(len(code2) + 1)]
+        for i, symbol in enumerate(code1, 1):
+            costs = matrix[index.get(symbol, other)]
+            cur = [i * indel]
+            for j, column in enumerate(columns, 1):
+                substitution = prev[j - 1] + (0.0 if symbol == code2[j - 1] else costs[column])
+                cur.append(min(substitution, prev[j] + indel, cur[j - 1] + indel))
+            if max_distance is not None and min(cur) > max_distance:
+                return max_distance + 1
+            prev = cur
+        if max_distance is not None and prev[-1] > max_distance:
+            return max_distance + 1
+        return prev[-1]
+
+    def distance_many(self, code, codes, max_distance=None):
+        """
+        Weighted edit distances between one code and many codes, with numpy the dynamic programming
+        runs over all codes at once (a padded matrix of symbol indices), the result is the same as of distance()
+        :param code: query code
+        :param codes: list of candidate codes
+        :param max_distance: distances above this bound are returned as max_distance + 1, optional
+        :return: list of distance values
+        """
+        if np is None or len(codes) < self._vectorize_from:
+            return [self.distance(code, other, max_distance) for other in codes]
+        if self.__array is None:
+            self.__array = np.array(self.__matrix)
+        index, other, indel = self.__index, len(self.alphabet), self.indel_cost
+        lengths = np.fromiter(map(len, codes), dtype=np.intp, count=len(codes))
+        n, width = len(codes), int(lengths.max())
+        points = np.frombuffer(''.join(codes).encode('utf-32-le'), dtype=np.uint32).astype(np.int64)
+        symbols = np.full((n, width), -1, dtype=np.int64)
+        symbols[np.arange(width) < lengths[:, None]] = points
+        lookup = np.full(max(int(points.max(initial=0)), max(map(ord, self.alphabet), default=0)) + 2, other)
+        lookup[[ord(symbol) for symbol in self.alphabet]] = np.arange(other)
+        columns = lookup[symbols]
+
+        prev = np.tile(np.arange(width + 1) * indel, (n, 1))
+        for i, symbol in enumerate(code, 1):
+            costs = np.where(symbols == ord(symbol), 0.0, self.__array[index.get(symbol, other)][columns])
+            best = np.minimum(prev[:, :-1] + costs, prev[:, 1:] + indel)
+            cur = np.empty_like(prev)
+            cur[:, 0] = i * indel
+            for j in range(1, width + 1):
+                cur[:, j] = np.minimum(best[:, j - 1], cur[:, j - 1] + indel)
+            prev = cur
+        result = prev[np.arange(n), lengths]
+        if max_distance is not None:
+            result = np.where(result > max_distance, max_distance + 1, result)
+        return result.tolist()
+
+
+class PhoneticsWeightedDistance(PhoneticsInnerLanguageDistance):
+    def __init__(self, phonetics, costs=None):
+        """
+        Init a weighted distance object
+        :param phonetics: an object of Soundex or Metaphone class
+        :param costs: SubstitutionCosts object, optional, derived from the algorithm tables by default
+        """
+        super().__init__(phonetics)
+        self.costs = costs or SubstitutionCosts.for_algorithm(phonetics)
+        self.metrics = self.bounded_metrics = self.costs.distance
+
+    def distance_many(self, word, words=None, max_distance=None, codes=None):
+        """
+        Scores many candidates against one word, the word is encoded once
+        :param word: original word
+        :param words: candidate words
+        :param max_distance: distances above this bound are returned as max_distance + 1, optional
+        :param codes: precomputed codes of candidates returned by code(), used instead of words
+        :return: list of distance values
+        """
+        if codes is None:
+            codes = [self.code(other) for other in words]
+        return self.costs.distance_many(self.code(word), codes, max_distance)
@@ -0,0 +1,143 @@
+import re
+
+from .base.base import BasePhoneticsAlgorithm
+from .bundle import pinned_bundle
+from .config import CYRILLIC_SYMBOLS, LATIN_SYMBOLS
+
+
+CYRILLIC = 'cyrillic'
+LATIN = 'latin'
+
+_homoglyphs = frozenset(CYRILLIC_SYMBOLS + LATIN_SYMBOLS)
+
+
+def detect_script(token):
+    """
+    Detects a script of a token by its first letter which can't be confused with a letter of another script,
+    letters with the same shape in Cyrillic and Latin (config.CYRILLIC_SYMBOLS, config.LATIN_SYMBOLS) are skipped
+    :param token: string
+    :return: CYRILLIC, LATIN or None if the token consists of such ambiguous letters only
+    """
+    for letter in token:
+        if letter in _homoglyphs or not letter.isalpha():
+            continue
+        return CYRILLIC if 'Ѐ' <= letter <= 'ӿ' else LATIN
+    return None
+
+
+class FullNameEncoder(BasePhoneticsAlgorithm):
+    """
+    Encoder of multi-token names ("Иванов Иван Иванович", "Järvinen Matti").
+    Every token is routed to the encoder of its script, tokens of many names are encoded
+    in batches by transform_many() of the encoders and joined into a composite key per name
+    """
+    __token_regex = re.compile(r'[^\W\d_]+')
+
+    def __init__(self, encoders, default_script=CYRILLIC, batch_size=1024, separator=' ', sort_tokens=False):
+        """
+        Init a full name encoder
+        :param encoders: dict script -> an object of BasePhoneticsAlgorithm class, e.g. {CYRILLIC: RussianSoundex()}
+        :param default_script: script for names which consist of ambiguous letters only
+            and for tokens of scripts without an encoder
+        :param batch_size: number of tokens which are collected before they are encoded
+        :param separator: separator of token codes in the key
+        :param sort_tokens: sort token codes, so the key does not depend on the order of name parts
+        """
+        assert default_script in encoders
+        assert all(isinstance(encoder, BasePhoneticsAlgorithm) for encoder in encoders.values())
+        assert batch_size > 0
+        self.encoders = dict(encoders)
+        self.default_script = default_script
+        self.batch_size = batch_size
+        self.separator = separator
+        self.sort_tokens = sort_tokens
+
+    def get_config(self):
+        encoders = ', '.join(f'{script}={self.encoders[script].get_config()}' for script in sorted(self.encoders))
+        return f'{super().get_config()[:-1]}, encoders=[{encoders}])'
+
+    def __resolve_scripts(self, scripts, start):
+        """
+        Ambiguous tokens of a name get the most frequent script of the other tokens of the name
+        """
+        counts = {}
+        for i in range(start, len(scripts)):
+            script = scripts[i]
+            if script is not None:
+                counts[script] = counts.get(script, 0) + 1
+        script = max(counts, key=counts.get) if counts else self.default_script
+        if script not in self.encoders:
+            script = self.default_script
+        for i in range(start, len(scripts)):
+            if scripts[i] is None or scripts[i] not in self.encoders:
+                scripts[i] = script
+
+    def __encode(self, tokens, scripts, skipped, metrics):
+        codes = [''] * len(tokens)
+        for i, code in skipped.items():
+            codes[i] = code
+        with pinned_bundle():
+            for script, encoder in self.encoders.items():
+                positions = [i for i, token_script in enumerate(scripts) if token_script == script and i not in skipped]
+                if positions:
+                    batch = encoder.transform_many([tokens[i] for i in positions], metrics=metrics)
+                    for i, code in zip(positions, batch):
+                        codes[i] = code
+        return codes
+
+    def __keys(self, bounds, codes, empty_code):
+        for start, end in bounds:
+            if start == end:
+                yield empty_code
+            else:
+                yield self.separator.join(sorted(codes[start:end]) if self.sort_tokens else codes[start:end])
+
+    def transform_stream(self, names, metrics=None, policy=None):
+        """
+        Lazily converts a stream of full names to composite keys, tokens of consecutive names
+        are collected into flat buffers and encoded when there are batch_size of them
+        :param names: iterable of strings
+        :param metrics: an EncodingMetrics object which counts tokens per encoder, optional
+        :param policy: an InputPolicy object which guards every token, optional, names without tokens
+            get its empty_code and rejected tokens get its reject_code
+        :return: generator of string keys
+        """
+        empty_code = '' if policy is None else policy.empty_code
+        tokens, scripts, bounds, skipped = [], [], [], {}
+        for name in names:
+            start = len(tokens)
+            if policy is not None and not isinstance(name, str):
+                name = ''
+            for match in self.__token_regex.finditer(name):
+                token = match.group().lower()
+                if policy is not None:
+                    token = policy.prepare(token)
+                    if not token:
+                        skipped[len(tokens)] = policy.skipped_code(token)
+                tokens.append(token)
+                scripts.append(detect_script(token) if token else None)
+            self.__resolve_scripts(scripts, start)
+            bounds.append((start, len(tokens)))
+            if len(tokens) >= self.batch_size:
+                yield from self.__keys(bounds, self.__encode(tokens, scripts, skipped, metrics), empty_code)
+                tokens, scripts, bounds, skipped = [], [], [], {}
+        if bounds:
+            yield from self.__keys(bounds, self.__encode(tokens, scripts, skipped, metrics), empty_code)
+
+    def transform_many(self, words, policy=None, cache=None, metrics=None):
+        """
+        Converts a batch of full names to composite keys
+        :param words: iterable of strings
+        :param policy: an InputPolicy object which is applied to every token, it can't be combined with a cache
+        :param cache: an EncodingCache object which is checked before encoding, optional
+        :param metrics: an EncodingMetrics object which counts encoded tokens, optional
+        :return: list of string keys
+        """
+        if cache is not None:
+            # a policy of the base class would clean whole names and glue their tokens together
+            assert policy is None, 'a policy of full names is applied per token, it can\'t be used with a cache'
+            return super().transform_many(words, cache=cache, metrics=metrics)
+        return list(self.transform_stream(words, metrics, policy))
+
+    def transform(self, word):
+        return next(self.transform_stream([word]))
@@ -0,0 +1,150 @@
+import heapq
+
+from .distance import PhoneticsInnerLanguageDistance
+from .ruleset import rules_version
+
+
+class PhoneticIndexException(Exception):
+    def __init__(self, msg):
+        self.msg = msg
+
+
+def check_rules_version(version, empty):
+    """
+    Codes of an index are valid only for the rules they were made with, an empty index takes the active rules
+    :param version: rules version of codes of an index
+    :param empty: the index has no codes yet
+    :return: rules version of the index
+    """
+    active = rules_version()
+    if active != version and not empty:
+        raise PhoneticIndexException(f'Index was built with rules {version}, the active rules are {active}, rebuild it!')
+    return active
+
+
+class PhoneticIndex:
+    """
+    In-memory index of words grouped by their phonetic codes
+    """
+    def __init__(self, phonetics, metric_name='levenstein'):
+        """
+        Init an index
+        :param phonetics: an object of BasePhoneticsAlgorithm class
+        :param metric_name: distance function name, optional, default is Levenstein distance
+        """
+        self.phonetics = phonetics
+        self.distancer = PhoneticsInnerLanguageDistance(phonetics, metric_name)
+        self.__buckets = {}
+        self.__size = 0
+        self.__rules_version = rules_version()
+
+    def check_rules(self):
+        """
+        Raises PhoneticIndexException if the index was built with other rules than the active ones
+        """
+        self.__rules_version = check_rules_version(self.__rules_version, not self.__buckets)
+
+    def code(self, word):
+        """
+        :param word: string
+        :return: code which is used as an index key
+        """
+        self.check_rules()
+        return self.distancer.code(word)
+
+    def add(self, word, code=None):
+        """
+        Adds a word to the index
+        :param word: string
+        :param code: precomputed code of the word, optional
+        """
+        self.check_rules()
+        bucket = self.__buckets.setdefault(self.code(word) if code is None else code, {})
+        if word not in bucket:
+            self.__size += 1
+        bucket[word] = bucket.get(word, 0) + 1
+
+    def add_many(self, words):
+        for word in words:
+            self.add(word)
+
+    def bucket(self, code):
+        """
+        :param code: index key
+        :return: dict of words with the given code and their frequencies
+        """
+        return self.__buckets.get(code, {})
+
+    def codes(self):
+        return self.__buckets.keys()
+
+    def within_code(self, code, max_distance):
+        """
+        :param code: index key of a query
+        :param max_distance: max distance between codes
+        :return: list of (distance, word) pairs sorted by distance
+        """
+        result = []
+        for other, bucket in self.__buckets.items():
+            dist = self.distancer.code_distance(code, other, max_distance)
+            if dist <= max_distance:
+                result.extend((dist, word) for word in bucket)
+        result.sort()
+        return result
+
+    def nearest_code(self, code, k):
+        """
+        :param code: index key of a query
+        :param k: number of words
+        :return: list of k (distance, word) pairs with the closest codes
+        """
+        heap = []
+        for other, bucket in self.__buckets.items():
+            if len(heap) < k:
+                dist = self.distancer.code_distance(code, other)
+            else:
+                dist = self.distancer.code_distance(code, other, -heap[0][0])
+            for word in bucket:
+                item = (-dist, _Reversed(word))
+                if len(heap) < k:
+                    heapq.heappush(heap, item)
+                elif item > heap[0]:
+                    heapq.heapreplace(heap, item)
+        return sorted((-dist, word.value) for dist, word in heap)
+
+    def within(self, word, max_distance):
+        """
+        Finds words which sound like a given one
+        :param word: string
+        :param max_distance: max distance between codes
+        :return: list of (distance, word) pairs sorted by distance
+        """
+        return self.within_code(self.code(word), max_distance)
+
+    def nearest(self, word, k):
+        """
+        Finds k words which sound the most like a given one
+        :param word: string
+        :param k: number of words
+        :return: list of (distance, word) pairs sorted by distance
+        """
+        return self.nearest_code(self.code(word), k)
+
+    def __len__(self):
+        return self.__size
+
+
+class _Reversed:
+    """
+    Inverts the order of words in a max-heap, so ties are resolved like in sorted()
+    """
+    __slots__ = ('value',)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __lt__(self, other):
+        return self.value > other.value
+
+    def __eq__(self, other):
+        return self.value == other.value
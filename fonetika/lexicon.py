@@ -0,0 +1,195 @@
+import argparse
+import ast
+import mmap
+import sys
+
+from . import metaphone, soundex
+from .base.base import BasePhoneticsAlgorithm
+from .ruleset import rules_version
+
+
+TABLE_MAGIC = b'FONETIKA-TABLE 1'
+# words with these characters would break the line and column structure of a table
+_separators = frozenset('\t\n\r')
+
+
+class CodeTableException(Exception):
+    def __init__(self, msg):
+        self.msg = msg
+
+
+def build_table(phonetics, words, path):
+    """
+    Precomputes codes for a given lexicon and writes a sorted word->code table
+    :param phonetics: an object of BasePhoneticsAlgorithm class
+    :param words: iterable of strings (names, patronymics, surnames...)
+    :param path: output file
+    :return: number of written words
+    """
+    assert isinstance(phonetics, BasePhoneticsAlgorithm)
+    table = {}
+    for word in words:
+        word = word.strip()
+        if word and _separators.isdisjoint(word) and word not in table:
+            table[word] = phonetics.transform(word)
+
+    with open(path, 'wb') as f:
+        header = '\t'.join([phonetics.get_config(), rules_version()])
+        f.write(TABLE_MAGIC + b'\t' + header.encode('utf-8') + b'\n')
+        for word in sorted(table):
+            f.write(f'{word}\t{table[word]}\n'.encode('utf-8'))
+    return len(table)
+
+
+class CodeTable:
+    """
+    Read-only precomputed word->code table, the file is mapped into memory lazily
+    and looked up with a binary search over its sorted lines
+    """
+    def __init__(self, path):
+        self.path = path
+        self.__file = None
+        self.__mm = None
+        self.__data_start = 0
+        self.__config = None
+        self.__rules_version = None
+
+    def __open(self):
+        self.__file = open(self.path, 'rb')
+        self.__mm = mmap.mmap(self.__file.fileno(), 0, access=mmap.ACCESS_READ)
+        header_end = self.__mm.find(b'\n')
+        magic, config, version = self.__mm[:header_end].decode('utf-8').split('\t')
+        if magic.encode('utf-8') != TABLE_MAGIC:
+            self.close()
+            raise CodeTableException(f'{self.path} is not a phonetic code table!')
+        self.__config, self.__rules_version = config, version
+        self.__data_start = header_end + 1
+
+    def __ensure_open(self):
+        if self.__mm is None:
+            self.__open()
+
+    def get_config(self):
+        """
+        :return: config of the algorithm which produced the table
+        """
+        self.__ensure_open()
+        return self.__config
+
+    def get_rules_version(self):
+        """
+        :return: version of rules the table was produced with
+        """
+        self.__ensure_open()
+        return self.__rules_version
+
+    def is_compatible(self, phonetics):
+        """
+        Checks whether the table was produced by the same algorithm, options and rules
+        :param phonetics: an object of BasePhoneticsAlgorithm class
+        :return: bool
+        """
+        return self.get_config() == phonetics.get_config() and self.get_rules_version() == rules_version()
+
+    def get(self, word):
+        """
+        Looks up a precomputed code
+        :param word: string
+        :return: string code or None if the word is not in the table
+        """
+        self.__ensure_open()
+        mm, key = self.__mm, word.encode('utf-8')
+        lo, hi = self.__data_start, len(mm)
+        while lo < hi:
+            mid = (lo + hi) // 2
+            pos = mm.rfind(b'\n', lo, mid)
+            line_start = lo if pos < 0 else pos + 1
+            line_end = mm.find(b'\n', line_start)
+            entry, _, code = mm[line_start:line_end].partition(b'\t')
+            if entry == key:
+                return code.decode('utf-8')
+            if entry < key:
+                lo = line_end + 1
+            else:
+                hi = line_start
+        return None
+
+    def close(self):
+        if self.__mm is not None:
+            self.__mm.close()
+            self.__file.close()
+        self.__mm, self.__file = None, None
+
+
+class LexiconEncoder(BasePhoneticsAlgorithm):
+    """
+    Algorithm wrapper which takes codes of frequent words from a precomputed table
+    and falls back to the full transformation for unseen words
+    """
+    def __init__(self, phonetics, path, strict=True):
+        """
+        Init a lexicon encoder
+        :param phonetics: an object of BasePhoneticsAlgorithm class
+        :param path: table file built by build_table() for the same algorithm config
+        :param strict: raise an exception if the table is stale, otherwise ignore the table
+        """
+        assert isinstance(phonetics, BasePhoneticsAlgorithm)
+        self.phonetics = phonetics
+        self.table = CodeTable(path)
+        self.strict = strict
+        self.__checked_version = None
+        self.__use_table = True
+
+    def __check_table(self):
+        self.__checked_version = rules_version()
+        self.__use_table = True
+        if not self.table.is_compatible(self.phonetics):
+            if self.strict:
+                raise CodeTableException(
+                    f'{self.table.path} was built for {self.table.get_config()} with rules '
+                    f'{self.table.get_rules_version()}, rebuild it for {self.phonetics.get_config()}!'
+                )
+            self.__use_table = False
+            self.table.close()
+
+    def get_config(self):
+        return self.phonetics.get_config()
+
+    def transform(self, word):
+        if self.__checked_version != rules_version():
+            self.__check_table()
+        if self.__use_table:
+            code = self.table.get(word)
+            if code is not None:
+                return code
+        return self.phonetics.transform(word)
+
+
+def _parse_option(option):
+    name, _, value = option.partition('=')
+    try:
+        return name, ast.literal_eval(value)
+    except (ValueError, SyntaxError):
+        return name, value
+
+
+def main(args=None):
+    parser = argparse.ArgumentParser(description='Build a precomputed phonetic code table from a word list')
+    parser.add_argument('words', help='file with one word per line')
+    parser.add_argument('output', help='table file')
+    parser.add_argument('--encoder', default='RussianSoundex', help='algorithm class name, e.g. RussianMetaphone')
+    parser.add_argument('--option', action='append', default=[], help='algorithm option, e.g. code_vowels=True')
+    args = parser.parse_args(args)
+
+    encoder_cls = getattr(soundex, args.encoder, None) or getattr(metaphone, args.encoder, None)
+    if encoder_cls is None:
+        parser.error(f'unknown encoder {args.encoder}')
+    phonetics = encoder_cls(**dict(_parse_option(option) for option in args.option))
+
+    with open(args.words, encoding='utf-8') as f:
+        count = build_table(phonetics, f, args.output)
+    print(f'{count} words for {phonetics.get_config()}, rules {rules_version()}', file=sys.stderr)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,109 @@
+import random
+import zlib
+
+from .index import PhoneticIndex
+
+
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+class PhoneticLSHIndex(PhoneticIndex):
+    """
+    Index of words with sub-linear approximate search: MinHash signatures of code n-grams
+    are split into bands, codes which share at least one band with a query are candidates,
+    only candidates are compared by the exact distance.
+    More bands of fewer rows give higher recall and more candidates
+    """
+    def __init__(self, phonetics, metric_name='levenstein', n_gram=2, bands=16, rows=2, seed=0):
+        """
+        Init an index
+        :param phonetics: an object of BasePhoneticsAlgorithm class, e.g. RussianMetaphone()
+        :param metric_name: distance function name, optional, default is Levenstein distance
+        :param n_gram: length of code n-grams
+        :param bands: number of hash tables
+        :param rows: number of MinHash values in a band
+        :param seed: seed of hash functions
+        """
+        assert n_gram > 0 and bands > 0 and rows > 0
+        super().__init__(phonetics, metric_name)
+        self.n_gram = n_gram
+        self.bands = bands
+        self.rows = rows
+        rnd = random.Random(seed)
+        self.__hash_params = [(rnd.randrange(1, _MERSENNE_PRIME), rnd.randrange(_MERSENNE_PRIME))
+                              for _ in range(bands * rows)]
+        self.__tables = [{} for _ in range(bands)]
+
+    def shingles(self, code):
+        """
+        :param code: index key
+        :return: set of hashed n-grams of the code with marked beginning and end
+        """
+        code = f'^{code}$'
+        n = min(self.n_gram, len(code))
+        return {zlib.crc32(code[i:i + n].encode('utf-8')) for i in range(len(code) - n + 1)}
+
+    def signature(self, code):
+        """
+        :param code: index key
+        :return: list of band keys
+        """
+        shingles, rows = self.shingles(code), self.rows
+        minhash = [min((a * shingle + b) % _MERSENNE_PRIME for shingle in shingles) for a, b in self.__hash_params]
+        return [tuple(minhash[i:i + rows]) for i in range(0, len(minhash), rows)]
+
+    def add(self, word, code=None):
+        self.check_rules()
+        code = self.code(word) if code is None else code
+        if not self.bucket(code):
+            for table, band in zip(self.__tables, self.signature(code)):
+                table.setdefault(band, []).append(code)
+        super().add(word, code)
+
+    def candidates(self, code):
+        """
+        :param code: index key of a query
+        :return: set of indexed codes which share a band with the query
+        """
+        result = set()
+        for table, band in zip(self.__tables, self.signature(code)):
+            result.update(table.get(band, ()))
+        return result
+
+    def within_code(self, code, max_distance):
+        result = []
+        for other in self.candidates(code):
+            dist = self.distancer.code_distance(code, other, max_distance)
+            if dist <= max_distance:
+                result.extend((dist, word) for word in self.bucket(other))
+        result.sort()
+        return result
+
+    def nearest_code(self, code, k):
+        result = []
+        for other in self.candidates(code):
+            dist = self.distancer.code_distance(code, other)
+            result.extend((dist, word) for word in self.bucket(other))
+        result.sort()
+        return result[:k]
+
+    def evaluate(self, words, max_distance):
+        """
+        Compares approximate search with the exact scan of all codes
+        :param words: queries
+        :param max_distance: max distance between codes
+        :return: dict with recall of the approximate search and the average share of compared codes
+        """
+        found, expected, compared, n_queries = 0, 0, 0, 0
+        for word in words:
+            code = self.code(word)
+            exact = set(PhoneticIndex.within_code(self, code, max_distance))
+            found += len(exact.intersection(self.within_code(code, max_distance)))
+            expected += len(exact)
+            compared += len(self.candidates(code))
+            n_queries += 1
+        n_codes = len(self.codes())
+        return {
+            'recall': found / expected if expected else 1.0,
+            'candidate_ratio': compared / (n_queries * n_codes) if n_queries and n_codes else 0.0
+        }
@@ -1,6 +1,10 @@
+import re
+
+from .accel import deaf_consonants, reduce_seq
 from .base.base import BasePhoneticsAlgorithm
 from .config import FI_VOWELS, RU_VOWELS, EE_VOWELS, RU_DEAF_CONSONANTS, \
     EE_FI_DEAF_CONSONANTS, SE_VOWELS, SE_DEAF_CONSONANTS, EN_DEAF_CONSONANTS, EN_VOWELS
+from .trace import traced
 from .ruleset import EstonianRuleSet, FinnishRuleSet, RussianRuleSet, SwedenRuleSet, EnglishMetaphoneRuleSet
 
 
@@ -24,18 +28,16 @@ class Metaphone(BasePhoneticsAlgorithm):
     def _deaf_consonants_letters(self, word):
         return word
 
+    @traced
     def _reduce_deaf_consonants_letters(self, word, criteria):
-        res = []
-        for i, letter in enumerate(word):
-            if letter in self._deaf_consonants_seq and (i == len(word) - 1 or word[i + 1].lower() not in criteria):
-                letter = letter.translate(self._deaf_consonants)
-            res += [letter]
-        return ''.join(res)
+        deaf_seq = self._deaf_consonants_seq
+        return deaf_consonants(word, deaf_seq, deaf_seq.translate(self._deaf_consonants), criteria)
 
     @staticmethod
     def __compress_word_ending(word):
         return word
 
+    @traced
     def _apply_metaphone_algorithm(self, word):
         if self._reduce_word:
             word = self._reduce_seq(word)
@@ -53,7 +55,7 @@ class EnglishMetaphone(Metaphone):
     """
     Metaphone for English language
     """
-    __rule_set = EnglishMetaphoneRuleSet()
+    _rule_set_class = EnglishMetaphoneRuleSet
 
     _vowels = EN_VOWELS
     _vowels_table = str.maketrans(EN_VOWELS, EN_VOWELS)
@@ -74,11 +76,35 @@ class EnglishMetaphone(Metaphone):
         return self._reduce_deaf_consonants_letters(word, self._vowels)
 
     def transform(self, word):
+        rule_set = self._rule_set()
         word = self._cyrillic2latin(word)
-        word = self.__rule_set.reduce_phonemes(word)
+        word = rule_set.reduce_phonemes(word)
         word = self._apply_metaphone_algorithm(word)
         if self.reduce_vowels:
-            word = word[0] + self.__rule_set.reduce_vowels(word[1:])
+            word = word[:1] + rule_set.reduce_vowels(word[1:])
+        return word
+
+
+class FastEnglishMetaphone(EnglishMetaphone):
+    """
+    Throughput-oriented Metaphone for English language, produces the same codes as EnglishMetaphone
+    in a few merged regex passes: phoneme rules are applied as groups of combined alternations
+    and deafening of consonants is a single regex substitution instead of a loop over letters
+    """
+    __deaf_regex = re.compile(rf'[{EN_DEAF_CONSONANTS}](?![{EN_VOWELS}{EN_VOWELS.upper()}])')
+    __deaf_table = dict(zip(EN_DEAF_CONSONANTS, 'tkkfs'))
+
+    def __deafen(self, match):
+        return self.__deaf_table[match.group()]
+
+    def transform(self, word):
+        rule_set = self._rule_set()
+        word = rule_set.reduce_phonemes_merged(self._cyrillic2latin(word))
+        if self._reduce_word:
+            word = reduce_seq(word)
+        word = self.__deaf_regex.sub(self.__deafen, word).upper()
+        if self.reduce_vowels:
+            word = word[:1] + rule_set.reduce_vowels(word[1:])
         return word
 
 
@@ -86,11 +112,13 @@ class RussianMetaphone(Metaphone):
     """
     Metaphone for Russian language
     """
+    _rule_set_class = RussianRuleSet
 
     _vowels = RU_VOWELS
     _deaf_consonants_seq = RU_DEAF_CONSONANTS
     _deaf_consonants = str.maketrans(_deaf_consonants_seq, 'пстфк')
     _vowels_table = str.maketrans(_vowels, 'ААААИИИИУУ')
+    _voiced_criterion = 'лмнр' + _vowels
 
     def __init__(self, compress_ending=False, reduce_word=True, reduce_phonemes=False,
                  replace_ego_ogo_endings=False, deaf_all_consonants=False, reduce_vowels=False):
@@ -108,33 +136,38 @@ class RussianMetaphone(Metaphone):
         self.replace_ego_ogo_endings = replace_ego_ogo_endings
         self.deaf_all_consonants = deaf_all_consonants
         self.reduce_vowels = reduce_vowels
-        self.rule_set = RussianRuleSet()
 
-    def __replace_j_vowels(self, word):
-        word = self.rule_set.replace_consonant_vowels(word)
-        word = self.rule_set.replace_j_vowel_phonemes(word)
-        word = self.rule_set.replace_j_and_signs(word)
-        return self.rule_set.replace_ii_ending(word)
+    @property
+    def rule_set(self):
+        return self._rule_set()
+
+    @staticmethod
+    def __replace_j_vowels(word, rule_set):
+        word = rule_set.replace_consonant_vowels(word)
+        word = rule_set.replace_j_vowel_phonemes(word)
+        word = rule_set.replace_j_and_signs(word)
+        return rule_set.replace_ii_ending(word)
 
     @staticmethod
     def _compress_ending(word):
         return word
 
     def _deaf_consonants_letters(self, word):
-        criterion = '' if self.deaf_all_consonants else 'лмнр' + self._vowels
+        criterion = '' if self.deaf_all_consonants else self._voiced_criterion
         return self._reduce_deaf_consonants_letters(word, criterion)
 
     def transform(self, word):
+        rule_set = self._rule_set()
         word = self._latin2cyrillic(word)
         if self.replace_ego_ogo_endings:
-            word = self.rule_set.replace_ego_ogo_ending(word)
+            word = rule_set.replace_ego_ogo_ending(word)
         if self.reduce_phonemes:
-            word = self.rule_set.reduce_phonemes(word)
-        word = self.__replace_j_vowels(word)
+            word = rule_set.reduce_phonemes(word)
+        word = self.__replace_j_vowels(word, rule_set)
         word = self._apply_metaphone_algorithm(word)
         if self.reduce_vowels:
             fitsr_letter_idx = 2 if word.startswith('J') else 1
-            word = word[:fitsr_letter_idx] + self.rule_set.reduce_vowels(word[fitsr_letter_idx:])
+            word = word[:fitsr_letter_idx] + rule_set.reduce_vowels(word[fitsr_letter_idx:])
         return word
 
 
@@ -142,19 +175,20 @@ class FinnishMetaphone(Metaphone):
     """
     Metaphone for Finnish language
     """
-    __rule_set = FinnishRuleSet()
+    _rule_set_class = FinnishRuleSet
 
     _vowels = FI_VOWELS
     _deaf_consonants_seq = EE_FI_DEAF_CONSONANTS
     _deaf_consonants = str.maketrans(_deaf_consonants_seq, 'pftk')
     _vowels_table = str.maketrans(FI_VOWELS, 'AAAIIIUU')
+    _voiced_criterion = _vowels + 'lmnr'
 
     def _deaf_consonants_letters(self, word):
-        return self._reduce_deaf_consonants_letters(word, self._vowels + 'lmnr')
+        return self._reduce_deaf_consonants_letters(word, self._voiced_criterion)
 
     def transform(self, word):
         word = self._cyrillic2latin(word)
-        word = self.__rule_set.reduce_phonemes(word)
+        word = self._rule_set().reduce_phonemes(word)
         return self._apply_metaphone_algorithm(word)
 
 
@@ -162,19 +196,20 @@ class EstonianMetaphone(Metaphone):
     """
     Metaphone for Estonian language
     """
-    __rule_set = EstonianRuleSet()
+    _rule_set_class = EstonianRuleSet
 
     _vowels = EE_VOWELS
     _deaf_consonants_seq = EE_FI_DEAF_CONSONANTS
     _deaf_consonants = str.maketrans(_deaf_consonants_seq, 'pftk')
     _vowels_table = str.maketrans(EE_VOWELS, 'AAAIIIIUU')
+    _voiced_criterion = _vowels + 'lmnr'
 
     def _deaf_consonants_letters(self, word):
-        return self._reduce_deaf_consonants_letters(word, self._vowels + 'lmnr')
+        return self._reduce_deaf_consonants_letters(word, self._voiced_criterion)
 
     def transform(self, word):
         word = self._cyrillic2latin(word)
-        word = self.__rule_set.reduce_phonemes(word)
+        word = self._rule_set().reduce_phonemes(word)
         return self._apply_metaphone_algorithm(word)
 
 
@@ -182,19 +217,20 @@ class SwedenMetaphone(Metaphone):
     """
     Metaphone for Sweden language
     """
-    __rule_set = SwedenRuleSet()
+    _rule_set_class = SwedenRuleSet
 
     _vowels = SE_VOWELS
     _deaf_consonants_seq = SE_DEAF_CONSONANTS
     _deaf_consonants = str.maketrans(_deaf_consonants_seq, 'pftk')
     _vowels_table = str.maketrans(SE_VOWELS, 'AAIIIIIUU')
+    _voiced_criterion = _vowels + 'lmnr'
 
     def _deaf_consonants_letters(self, word):
-        return self._reduce_deaf_consonants_letters(word, self._vowels + 'lmnr')
+        return self._reduce_deaf_consonants_letters(word, self._voiced_criterion)
 
     def transform(self, word):
         word = self._cyrillic2latin(word)
         if word.endswith('on') and not word.endswith('hon'):
             word = word[:-2] + 'ån'
-        word = self.__rule_set.reduce_phonemes(word)
+        word = self._rule_set().reduce_phonemes(word)
         return self._apply_metaphone_algorithm(word)
@@ -0,0 +1,177 @@
+import heapq
+import os
+import time
+
+from time import perf_counter
+
+
+class EncodingMetrics:
+    """
+    Live counters of a long-running encoding job. Every word is timed for the list of the slowest words,
+    every sample_every-th one is sampled for the mean latency, snapshots are published to sinks
+    at most once per interval seconds
+    """
+    def __init__(self, sinks=(), interval=10.0, sample_every=64, slowest=10):
+        """
+        Init metrics
+        :param sinks: callables which take a snapshot dict, e.g. DictSink(), TextSink(path) or print
+        :param interval: min number of seconds between publications
+        :param sample_every: sample one word of this number for the mean latency and the check of the interval
+        :param slowest: number of the slowest words kept in snapshots
+        """
+        assert interval >= 0 and sample_every > 0 and slowest >= 0
+        self.sinks = list(sinks)
+        self.interval = interval
+        self.sample_every = sample_every
+        self.slowest = slowest
+        self.reset()
+
+    def reset(self):
+        """
+        Clears all counters
+        """
+        self.__start = self.__last_publish = time.monotonic()
+        self.__last_words = 0
+        self.__recent_rate = 0.0
+        self.__words = 0
+        self.__cache_hits = 0
+        self.__cache_lookups = 0
+        self.__encoders = {}
+        self.__slowest = []
+        self.__samples = 0
+        self.__sampled_time = 0.0
+        self.__queue_depth = 0
+
+    def __count(self, phonetics, n):
+        name = type(phonetics).__name__
+        self.__encoders[name] = self.__encoders.get(name, 0) + n
+        self.__words += n
+
+    def observe(self, phonetics, word, transform):
+        """
+        Encodes a word and counts it
+        :param phonetics: algorithm which encodes the word, its class is counted in the language mix
+        :param word: string
+        :param transform: function which returns a code of the word
+        :return: string code
+        """
+        self.__count(phonetics, 1)
+        start = perf_counter()
+        code = transform(word)
+        elapsed = perf_counter() - start
+        slowest = self.__slowest
+        if len(slowest) < self.slowest:
+            heapq.heappush(slowest, (elapsed, word, type(phonetics).__name__))
+        elif slowest and elapsed > slowest[0][0]:
+            heapq.heapreplace(slowest, (elapsed, word, type(phonetics).__name__))
+        if not self.__words % self.sample_every:
+            self.__samples += 1
+            self.__sampled_time += elapsed
+            self.__maybe_publish()
+        return code
+
+    def count_hits(self, phonetics, n=1):
+        """
+        Counts words which were served from a cache without encoding
+        """
+        self.__count(phonetics, n)
+        self.__cache_hits += n
+        self.__cache_lookups += n
+        if self.__words % self.sample_every < n:
+            self.__maybe_publish()
+
+    def count_misses(self, n=1):
+        """
+        Counts cache lookups which missed, the words themselves are counted by observe()
+        """
+        self.__cache_lookups += n
+
+    def set_queue_depth(self, depth):
+        """
+        :param depth: number of requests waiting for parallel workers
+        """
+        self.__queue_depth = depth
+
+    def __maybe_publish(self):
+        if time.monotonic() - self.__last_publish >= self.interval:
+            self.publish()
+
+    def snapshot(self):
+        """
+        :return: dict with current values of all counters
+        """
+        elapsed = time.monotonic() - self.__start
+        words = self.__words
+        return {
+            'words': words,
+            'elapsed': elapsed,
+            'words_per_sec': words / elapsed if elapsed else 0.0,
+            'recent_words_per_sec': self.__recent_rate,
+            'cache_lookups': self.__cache_lookups,
+            'cache_hit_ratio': self.__cache_hits / self.__cache_lookups if self.__cache_lookups else 0.0,
+            'encoders': dict(self.__encoders),
+            'language_mix': {name: count / words for name, count in self.__encoders.items()} if words else {},
+            'mean_latency': self.__sampled_time / self.__samples if self.__samples else 0.0,
+            'slowest': sorted(self.__slowest, reverse=True),
+            'queue_depth': self.__queue_depth,
+        }
+
+    def publish(self):
+        """
+        Sends a snapshot to all sinks
+        :return: snapshot dict
+        """
+        now = time.monotonic()
+        if now > self.__last_publish:
+            self.__recent_rate = (self.__words - self.__last_words) / (now - self.__last_publish)
+        self.__last_publish, self.__last_words = now, self.__words
+        snapshot = self.snapshot()
+        for sink in self.sinks:
+            sink(snapshot)
+        return snapshot
+
+
+class DictSink:
+    """
+    Keeps the last published snapshot in the stats dict
+    """
+    def __init__(self):
+        self.stats = {}
+
+    def __call__(self, snapshot):
+        self.stats = snapshot
+
+
+def format_text(snapshot, prefix='fonetika'):
+    """
+    Text exposition of a snapshot in the Prometheus format
+    :param snapshot: dict returned by EncodingMetrics.snapshot()
+    :param prefix: prefix of metric names
+    :return: string
+    """
+    lines = []
+    for name in ('words', 'elapsed', 'words_per_sec', 'recent_words_per_sec', 'cache_lookups', 'cache_hit_ratio',
+                 'mean_latency', 'queue_depth'):
+        lines.append(f'{prefix}_{name} {snapshot[name]:g}')
+    for name, count in sorted(snapshot['encoders'].items()):
+        lines.append(f'{prefix}_encoder_words{{encoder="{name}"}} {count}')
+    for rank, (elapsed, word, name) in enumerate(snapshot['slowest'], 1):
+        word = word.replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+        lines.append(f'{prefix}_slowest_word_seconds{{rank="{rank}",word="{word}",encoder="{name}"}} {elapsed:g}')
+    return '\n'.join(lines) + '\n'
+
+
+class TextSink:
+    """
+    Rewrites a file with the text exposition of every snapshot, the file is replaced atomically,
+    so it may be scraped at any moment
+    """
+    def __init__(self, path, prefix='fonetika'):
+        self.path = path
+        self.prefix = prefix
+
+    def __call__(self, snapshot):
+        tmp_path = f'{self.path}.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.write(format_text(snapshot, self.prefix))
+        os.replace(tmp_path, self.path)
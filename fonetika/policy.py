@@ -0,0 +1,71 @@
+import re
+
+
+class InputPolicy:
+    """
+    Input guards for batch processing: every word is cleaned and bounded in one prepass
+    before it reaches the transcription rules, bad words get fixed codes instead of failing a batch
+    """
+    __non_alpha_regex = re.compile(r'[\W\d_]+')
+
+    def __init__(self, max_length=64, truncate=True, strip_non_alpha=True, empty_code='', reject_code=''):
+        """
+        Init an input policy
+        :param max_length: max length of a word passed to an algorithm, None means no limit
+        :param truncate: cut too long words, otherwise they are rejected
+        :param strip_non_alpha: remove digits, punctuation and spaces from words
+        :param empty_code: code for empty words (and for non-string values)
+        :param reject_code: code for rejected too long words
+        """
+        assert max_length is None or max_length > 0
+        self.max_length = max_length
+        self.truncate = truncate
+        self.strip_non_alpha = strip_non_alpha
+        self.empty_code = empty_code
+        self.reject_code = reject_code
+        self.__stats = {'words': 0, 'empty': 0, 'truncated': 0, 'rejected': 0}
+
+    def prepare(self, word):
+        """
+        Cleans a word according to the policy
+        :param word: string
+        :return: cleaned string, may be empty, None if the word is rejected
+        """
+        stats = self.__stats
+        stats['words'] += 1
+        if not isinstance(word, str):
+            word = ''
+        elif self.strip_non_alpha:
+            word = self.__non_alpha_regex.sub('', word)
+        if self.max_length is not None and len(word) > self.max_length:
+            if not self.truncate:
+                stats['rejected'] += 1
+                return None
+            stats['truncated'] += 1
+            word = word[:self.max_length]
+        if not word:
+            stats['empty'] += 1
+        return word
+
+    def skipped_code(self, word):
+        """
+        :param word: result of prepare() which is not encoded, an empty string or None
+        :return: empty_code or reject_code
+        """
+        return self.empty_code if word is not None else self.reject_code
+
+    def transform(self, phonetics, word):
+        """
+        Converts a given word to phonetic code under the policy
+        :param phonetics: an object of BasePhoneticsAlgorithm class
+        :param word: string
+        :return: string code
+        """
+        word = self.prepare(word)
+        return phonetics.transform(word) if word else self.skipped_code(word)
+
+    def get_stats(self):
+        """
+        :return: dict with counters of prepared, empty, truncated and rejected words
+        """
+        return dict(self.__stats)
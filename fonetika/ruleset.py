@@ -1,12 +1,132 @@
+import re
+
 from abc import ABC, abstractmethod
 
-from .config import EN_REMOVE_MAP, RU_PHONEMES, RU_REMOVE_MAP, \
-    RU_REPLACEMENT_J_MAP, RU_REPLACEMENT_VOWEL_MAP, RU_REPLACEMENT_CONSONANT_MAP, \
-    EN_PHONEMES, EE_PHONEMES, FI_PHONEMES, SE_PHONEMES, \
-    RU_EGO_OGO_ENDING, RU_IA_ENDING, RU_II_ENDING, EN_METAPHONE_PHONEMES, EN_VOWELS_TO_REMOVE, RU_VOWELS_TO_REMOVE
+from .bundle import active_bundle
+from .trace import traced, traced_rules
+
+
+def rules_version():
+    """
+    Version hash of the active rule bundle and all tables from the config module,
+    the hash changes whenever any rule is changed
+    :return: hex string
+    """
+    return active_bundle().version
+
+
+_INLINE_FLAGS = ((re.IGNORECASE, 'i'), (re.MULTILINE, 'm'), (re.DOTALL, 's'), (re.VERBOSE, 'x'), (re.ASCII, 'a'))
+
+# a numbered reference to a group or a condition on a group, which would point to another group after merging
+_GROUP_REFERENCE = re.compile(r'(?<!\\)(?:\\\\)*\\[1-9]|\(\?\(\d')
+
+# global inline flags of a pattern, they are kept in flags of the compiled rule
+_GLOBAL_FLAGS = re.compile(r'^(?:\(\?[aiLmsux]+\))+')
+
+# private use symbols which stand for groups while a replacement template is parsed
+_GROUP_MARKER = 0xF0000
+
+
+def _inline_flags(flags):
+    return ''.join(letter for flag, letter in _INLINE_FLAGS if flags & flag)
+
+
+def _replacement_pieces(rule, result, group):
+    """
+    Parses a replacement template of a rule with the re module itself: the template is expanded over a match
+    whose groups are marker symbols, so escapes and references like \\g<0>, \\g<name> or \\10 are resolved
+    in the same way as in rule.sub()
+    :param rule: compiled regex
+    :param result: replacement template
+    :param group: number of the group of the rule in the merged regex
+    :return: string for literal replacements, list of strings and numbers of groups of the merged regex otherwise
+    """
+    names = {index: name for name, index in rule.groupindex.items()}
+    markers = [chr(_GROUP_MARKER + i) for i in range(rule.groups + 1)]
+    pattern = markers[0] + ''.join(f'(?P<{names[i]}>{markers[i]})' if i in names else f'({markers[i]})'
+                                   for i in range(1, len(markers)))
+    expanded = re.fullmatch(pattern, ''.join(markers)).expand(result)
+    pieces, skip = [], 0
+    for i, piece in enumerate(re.split(f'([{markers[0]}-{markers[-1]}])', expanded)):
+        if not i % 2:
+            if piece:
+                pieces.append(piece)
+        elif skip:
+            skip -= 1
+        else:
+            # the whole match is expanded to the markers of all groups, they are a single piece
+            number = ord(piece) - _GROUP_MARKER
+            skip = 0 if number else rule.groups
+            pieces.append(group + number)
+    if all(isinstance(piece, str) for piece in pieces):
+        return ''.join(pieces)
+    return pieces
+
+
+def merge_rules(rules):
+    """
+    Combines substitution rules into one alternation regex, a match is dispatched to the replacement
+    of its rule. The result is the same as of sequential application only for rules which don't interact
+    :param rules: list of (compiled regex, replacement) pairs, flags of every rule are kept,
+        patterns can't refer to their groups by numbers
+    :return: compiled regex and a replacement function for its sub()
+    """
+    common_flags = {rule.flags for rule, _ in rules}
+    parts, replacements, group = [], {}, 1
+    for rule, result in rules:
+        assert not (rule.groups and _GROUP_REFERENCE.search(rule.pattern)), \
+            f'Group numbers of {rule.pattern} are shifted by merging, use named groups'
+        pattern = _GLOBAL_FLAGS.sub('', rule.pattern)
+        if rule.flags & re.VERBOSE:
+            pattern += '\n'
+        if len(common_flags) > 1 and _inline_flags(rule.flags):
+            pattern = f'(?{_inline_flags(rule.flags)}:{pattern})'
+        parts.append(f'({pattern})')
+        replacements[group] = _replacement_pieces(rule, result, group)
+        group += 1 + rule.groups
+
+    def replace(match):
+        pieces = replacements[match.lastindex]
+        if isinstance(pieces, str):
+            return pieces
+        return ''.join(piece if isinstance(piece, str) else match.group(piece) or '' for piece in pieces)
+
+    flags = common_flags.pop() if len(common_flags) == 1 else 0
+    return re.compile('|'.join(parts), flags), replace
+
+
+def split_rules(rules, sizes):
+    """
+    :param rules: list of rules
+    :param sizes: sizes of consecutive groups
+    :return: list of groups of rules
+    """
+    groups, start = [], 0
+    for size in sizes:
+        groups.append(rules[start:start + size])
+        start += size
+    assert start == len(rules)
+    return groups
 
 
 class RuleSet(ABC):
+    """
+    Transcription rules of a language taken from a rule bundle. Rule sets are immutable,
+    so a bundle keeps a single shared instance of every class, see active()
+    """
+    def __init__(self, bundle):
+        """
+        Init a rule set, rules are looked up in the bundle once
+        :param bundle: RuleBundle object
+        """
+
+    @classmethod
+    def active(cls):
+        """
+        :return: rule set of the bundle which is active in the current context
+        """
+        return active_bundle().derive(cls, cls)
+
     @abstractmethod
     def _replacement_phoneme_map(self):
         """
@@ -14,11 +134,13 @@ class RuleSet(ABC):
         """
         return []
 
+    @traced_rules
     def _replace_rules(self, word, rules):
         for replace, result in rules:
             word = replace.sub(result, word)
         return word
 
+    @traced
     def reduce_phonemes(self, word):
         """
         Transcripts a given word into phonological sequence by language rules
@@ -32,36 +154,48 @@ class RussianRuleSet(RuleSet):
     """
     Transcription rules for Russian language
     """
-    __replacement_j_map = RU_REPLACEMENT_J_MAP
-    __replacement_vowel_map = RU_REPLACEMENT_VOWEL_MAP
-    __replacement_consonant_map = RU_REPLACEMENT_CONSONANT_MAP
-    __remove_map = RU_REMOVE_MAP
-    __remove_vowels = RU_VOWELS_TO_REMOVE
-    __ia_ending = RU_IA_ENDING
-    __ii_ending = RU_II_ENDING
-    __ego_ogo_endings = RU_EGO_OGO_ENDING
+    def __init__(self, bundle):
+        super().__init__(bundle)
+        self.__phonemes = bundle['RU_PHONEMES']
+        self.__replacement_j_vowel_map = bundle['RU_REPLACEMENT_J_MAP'] + bundle['RU_REPLACEMENT_VOWEL_MAP']
+        self.__replacement_consonant_map = bundle['RU_REPLACEMENT_CONSONANT_MAP']
+        self.__remove_map = bundle['RU_REMOVE_MAP']
+        self.__remove_vowels = bundle['RU_VOWELS_TO_REMOVE']
+        self.__ia_ending = bundle['RU_IA_ENDING']
+        self.__ii_ending = bundle['RU_II_ENDING']
+        self.__ego_ogo_endings = bundle['RU_EGO_OGO_ENDING']
 
     def _replacement_phoneme_map(self):
-        return RU_PHONEMES
+        return self.__phonemes
 
+    @traced
     def replace_consonant_vowels(self, word):
         return self._replace_rules(word, self.__replacement_consonant_map)
 
+    def has_ego_ogo_ending(self, word):
+        return self.__ego_ogo_endings.search(word) is not None
+
+    @traced
     def replace_ego_ogo_ending(self, word):
         return self.__ego_ogo_endings.sub(r'\1в\3', word)
 
+    @traced
     def replace_ia_ending(self, word):
         return self.__ia_ending.sub('я', word)
 
+    @traced
     def replace_ii_ending(self, word):
         return self.__ii_ending.sub('и', word)
 
+    @traced
     def replace_j_and_signs(self, word):
         return self._replace_rules(word, self.__remove_map)
 
+    @traced
     def replace_j_vowel_phonemes(self, word):
-        return self._replace_rules(word, self.__replacement_j_map + self.__replacement_vowel_map)
+        return self._replace_rules(word, self.__replacement_j_vowel_map)
 
+    @traced
     def reduce_vowels(self, word):
         return self._replace_rules(word, self.__remove_vowels)
 
@@ -70,51 +204,91 @@ class SwedenRuleSet(RuleSet):
     """
     Transcription rules for Swedish language
     """
+    def __init__(self, bundle):
+        super().__init__(bundle)
+        self.__phonemes = bundle['SE_PHONEMES']
+
     def _replacement_phoneme_map(self):
-        return SE_PHONEMES
+        return self.__phonemes
 
 
 class EstonianRuleSet(RuleSet):
     """
     Transcription rules for Estonian language
     """
+    def __init__(self, bundle):
+        super().__init__(bundle)
+        self.__phonemes = bundle['EE_PHONEMES']
+
     def _replacement_phoneme_map(self):
-        return EE_PHONEMES
+        return self.__phonemes
 
 
 class FinnishRuleSet(RuleSet):
     """
     Transcription rules for Finnish language
     """
+    def __init__(self, bundle):
+        super().__init__(bundle)
+        self.__phonemes = bundle['FI_PHONEMES']
+
     def _replacement_phoneme_map(self):
-        return FI_PHONEMES
+        return self.__phonemes
 
 
 class EnglishRuleSet(RuleSet):
     """
     Transcription rules for English language
     """
-    def _replacement_phoneme_map(self):
-        return EN_PHONEMES
+    def __init__(self, bundle):
+        super().__init__(bundle)
+        self.__phonemes = bundle['EN_PHONEMES']
+        self.__remove_map = bundle['EN_REMOVE_MAP']
 
-    __remove_map = EN_REMOVE_MAP
+    def _replacement_phoneme_map(self):
+        return self.__phonemes
 
+    @traced
     def remove_empty_sounds(self, word):
         return self._replace_rules(word, self.__remove_map)
 
 
+def _merge_metaphone_phonemes(bundle):
+    rules = bundle['EN_METAPHONE_PHONEMES']
+    if not bundle.is_shipped('EN_METAPHONE_PHONEMES', 'EN_METAPHONE_PASSES'):
+        # passes are validated for the shipped rules only, changed rules are applied one by one as they are
+        return rules
+    return tuple(merge_rules(rules) for rules in split_rules(rules, bundle['EN_METAPHONE_PASSES']))
+
+
 class EnglishMetaphoneRuleSet(RuleSet):
     """
     Transcription rules for English language
     """
-    def _replacement_phoneme_map(self):
-        return EN_METAPHONE_PHONEMES
+    def __init__(self, bundle):
+        super().__init__(bundle)
+        self.__phonemes = bundle['EN_METAPHONE_PHONEMES']
+        self.__merged_phonemes = _merge_metaphone_phonemes(bundle)
+        self.__remove_map = bundle['EN_REMOVE_MAP']
+        self.__remove_vowels = bundle['EN_VOWELS_TO_REMOVE']
 
-    __remove_map = EN_REMOVE_MAP
-    __remove_vowels = EN_VOWELS_TO_REMOVE
+    def _replacement_phoneme_map(self):
+        return self.__phonemes
 
+    @traced
     def remove_empty_sounds(self, word):
         return self._replace_rules(word, self.__remove_map)
 
+    @traced
     def reduce_vowels(self, word):
         return self._replace_rules(word, self.__remove_vowels)
+
+    def reduce_phonemes_merged(self, word):
+        """
+        The same as reduce_phonemes() in fewer passes over a word
+        :param word: string
+        :return: modified string
+        """
+        for pattern, replace in self.__merged_phonemes:
+            word = pattern.sub(replace, word)
+        return word
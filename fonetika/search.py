@@ -0,0 +1,84 @@
+import bisect
+
+from collections import namedtuple
+from time import perf_counter
+
+from .index import PhoneticIndex
+
+
+SearchResult = namedtuple('SearchResult', ['matches', 'stage', 'timings'])
+
+
+class PhoneticSearch:
+    """
+    Approximate name search over several phonetic indexes.
+    Queries run a cascade from the cheapest stage to the most expensive one:
+    exact code buckets, codes with the same prefix, then a bounded distance scan of the rest,
+    and stop as soon as enough candidates are found
+    """
+    STAGES = ('exact', 'prefix', 'scan')
+
+    def __init__(self, encoders, words=(), metric_name='levenstein', prefix_len=2):
+        """
+        Init a search engine
+        :param encoders: list of BasePhoneticsAlgorithm objects, e.g. [RussianSoundex(), RussianMetaphone()]
+        :param words: initial words, optional
+        :param metric_name: distance function name, optional, default is Levenstein distance
+        :param prefix_len: number of first code symbols of neighbour codes in the prefix stage
+        """
+        assert encoders
+        self.indexes = [PhoneticIndex(encoder, metric_name) for encoder in encoders]
+        self.prefix_len = prefix_len
+        self.__sorted_codes = None
+        self.add_many(words)
+
+    def add_many(self, words):
+        for word in words:
+            for index in self.indexes:
+                index.add(word)
+        self.__sorted_codes = None
+
+    def __codes(self):
+        if self.__sorted_codes is None:
+            self.__sorted_codes = [sorted(index.codes()) for index in self.indexes]
+        return self.__sorted_codes
+
+    @staticmethod
+    def __collect(matches, index, code, others, max_distance):
+        for other in others:
+            dist = index.distancer.code_distance(code, other, max_distance)
+            if dist <= max_distance:
+                for word in index.bucket(other):
+                    if dist < matches.get(word, max_distance + 1):
+                        matches[word] = dist
+
+    def search(self, word, limit=10, max_distance=1):
+        """
+        Finds words which sound like a given one
+        :param word: string
+        :param limit: number of candidates which is enough to stop
+        :param max_distance: max distance between codes of candidates
+        :return: SearchResult with (distance, word) matches, the last executed stage and per-stage timings
+        """
+        matches, timings = {}, {}
+        codes = [index.code(word) for index in self.indexes]
+        sorted_codes = self.__codes()
+        stage = None
+        for stage in self.STAGES:
+            start = perf_counter()
+            for index, code, all_codes in zip(self.indexes, codes, sorted_codes):
+                prefix = code[:self.prefix_len]
+                lo = bisect.bisect_left(all_codes, prefix)
+                hi = bisect.bisect_right(all_codes, prefix + '\U0010ffff', lo)
+                if stage == 'exact':
+                    others = [code] if code in index.codes() else []
+                elif stage == 'prefix':
+                    others = (other for other in all_codes[lo:hi] if other != code)
+                else:
+                    others = all_codes[:lo] + all_codes[hi:]
+                self.__collect(matches, index, code, others, max_distance)
+            timings[stage] = perf_counter() - start
+            if len(matches) >= limit:
+                break
+        result = sorted((dist, other) for other, dist in matches.items())[:limit]
+        return SearchResult(result, stage, timings)
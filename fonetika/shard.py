@@ -0,0 +1,166 @@
+import heapq
+import multiprocessing
+import zlib
+
+from .index import PhoneticIndex, check_rules_version
+from .ruleset import rules_version
+
+
+def shard_of(code, n_shards, prefix_len=None):
+    """
+    Stable partitioning of phonetic codes, it doesn't depend on a process or a host,
+    so shards may be placed on separate nodes
+    :param code: index key of a word
+    :param n_shards: number of shards
+    :param prefix_len: hash only first symbols of a code (keeps close codes together), optional
+    :return: shard number
+    """
+    key = code if prefix_len is None else code[:prefix_len]
+    return zlib.crc32(key.encode('utf-8')) % n_shards
+
+
+class ShardException(Exception):
+    def __init__(self, msg):
+        self.msg = msg
+
+
+def _serve_shard(conn, phonetics, metric_name):
+    index = PhoneticIndex(phonetics, metric_name)
+    while True:
+        command, args = conn.recv()
+        if command == 'close':
+            conn.close()
+            return
+        try:
+            if command == 'add':
+                for word, code in args:
+                    index.add(word, code)
+                result = len(index)
+            elif command == 'within':
+                result = index.within_code(*args)
+            elif command == 'nearest':
+                result = index.nearest_code(*args)
+            elif command == 'size':
+                result = len(index)
+            else:
+                raise ValueError(f'Unknown command {command}')
+            conn.send((True, result))
+        except Exception as e:
+            conn.send((False, repr(e)))
+
+
+class ShardedIndex:
+    """
+    Phonetic index partitioned by codes between local worker processes.
+    Each worker owns a shard built with the same algorithm config,
+    queries are fanned out to all shards and the results are merged
+    """
+    def __init__(self, phonetics, n_shards=4, prefix_len=None, metric_name='levenstein', mp_context=None,
+                 metrics=None):
+        """
+        Init a sharded index and start workers
+        :param phonetics: an object of BasePhoneticsAlgorithm class, it is copied into every worker
+        :param n_shards: number of worker processes
+        :param prefix_len: partition by first symbols of codes, optional
+        :param metric_name: distance function name, optional, default is Levenstein distance
+        :param mp_context: multiprocessing context, optional
+        :param metrics: an EncodingMetrics object which counts encoded words and requests waiting for workers, optional
+        """
+        assert n_shards > 0
+        self.n_shards = n_shards
+        self.prefix_len = prefix_len
+        self.metrics = metrics
+        self.__local = PhoneticIndex(phonetics, metric_name)
+        # workers get codes only, so the rules of shards are checked here
+        self.__rules_version = rules_version()
+        self.__empty = True
+        ctx = mp_context or multiprocessing.get_context()
+        self.__conns, self.__workers = [], []
+        for _ in range(n_shards):
+            conn, worker_conn = ctx.Pipe()
+            worker = ctx.Process(target=_serve_shard, args=(worker_conn, phonetics, metric_name), daemon=True)
+            worker.start()
+            worker_conn.close()
+            self.__conns.append(conn)
+            self.__workers.append(worker)
+
+    def __request_all(self, messages):
+        pending = 0
+        for conn, message in zip(self.__conns, messages):
+            if message is not None:
+                conn.send(message)
+                pending += 1
+                if self.metrics is not None:
+                    self.metrics.set_queue_depth(pending)
+        results = []
+        for conn, message in zip(self.__conns, messages):
+            if message is None:
+                continue
+            ok, result = conn.recv()
+            pending -= 1
+            if self.metrics is not None:
+                self.metrics.set_queue_depth(pending)
+            if not ok:
+                raise ShardException(result)
+            results.append(result)
+        return results
+
+    def shard_of(self, code):
+        return shard_of(code, self.n_shards, self.prefix_len)
+
+    def __code(self, word):
+        self.__rules_version = check_rules_version(self.__rules_version, self.__empty)
+        return self.__local.code(word)
+
+    def add_many(self, words):
+        """
+        Encodes words and sends them to their shards
+        :param words: iterable of strings
+        """
+        batches = [[] for _ in range(self.n_shards)]
+        for word in words:
+            if self.metrics is None:
+                code = self.__code(word)
+            else:
+                code = self.metrics.observe(self.__local.phonetics, word, self.__code)
+            batches[self.shard_of(code)].append((word, code))
+            self.__empty = False
+        self.__request_all([('add', batch) if batch else None for batch in batches])
+
+    def within(self, word, max_distance):
+        """
+        :param word: string
+        :param max_distance: max distance between codes
+        :return: list of (distance, word) pairs sorted by distance
+        """
+        code = self.__code(word)
+        return list(heapq.merge(*self.__request_all([('within', (code, max_distance))] * self.n_shards)))
+
+    def nearest(self, word, k):
+        """
+        :param word: string
+        :param k: number of words
+        :return: list of (distance, word) pairs sorted by distance
+        """
+        code = self.__code(word)
+        return list(heapq.merge(*self.__request_all([('nearest', (code, k))] * self.n_shards)))[:k]
+
+    def __len__(self):
+        return sum(self.__request_all([('size', None)] * self.n_shards))
+
+    def close(self):
+        """
+        Stops worker processes
+        """
+        for conn, worker in zip(self.__conns, self.__workers):
+            if worker.is_alive():
+                conn.send(('close', None))
+                worker.join()
+            conn.close()
+        self.__conns, self.__workers = [], []
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -1,12 +1,27 @@
 import re
 
+from functools import lru_cache
+
 import pymorphy2
 
+from .accel import translate_vowels
 from .base.base import BasePhoneticsAlgorithm
-from .config import RU_VOWELS, EN_VOWELS, FI_VOWELS, EE_VOWELS, SE_VOWELS
+from .batch import soundex_transform_batch
+from .bundle import pinned_bundle
+from .config import RU_VOWELS, EN_VOWELS, FI_VOWELS, EE_VOWELS, SE_VOWELS, \
+    RU_EGO_OGO_FORMS, RU_NOT_EGO_OGO_FORMS
+from .trace import traced
 from .ruleset import EnglishRuleSet, EstonianRuleSet, FinnishRuleSet, RussianRuleSet, SwedenRuleSet
 
 
+@lru_cache(maxsize=None)
+def _morph_analyzer():
+    """
+    Morphological analyzer holds large dictionaries, so it is shared between all Soundex objects
+    """
+    return pymorphy2.MorphAnalyzer()
+
+
 class Soundex(BasePhoneticsAlgorithm):
     """
     Basic class for Soundex algorithm
@@ -34,21 +49,21 @@ class Soundex(BasePhoneticsAlgorithm):
         self.__seq_cutted_len = seq_cutted_len
         self.__code_vowels = code_vowels
 
-    def __is_vowel(self, letter):
-        return letter in self._vowels
-
     def __translate_vowels(self, word):
         if self.__code_vowels:
             return word.translate(self._vowels_table)
         else:
-            return ''.join('0' if self.__is_vowel(letter) else letter for letter in word)
+            return translate_vowels(word, self._vowels)
 
     def __remove_vowels_and_paired_sounds(self, seq):
         seq = self._vowels_regex.sub('', seq)
         seq = self._reduce_seq(seq)
         return seq
 
+    @traced
     def _apply_soundex_algorithm(self, word):
+        if not word:
+            return ''
         word = word.lower()
         first, last = word[0], word
         last = last.translate(self._table)
@@ -74,85 +89,120 @@ class Soundex(BasePhoneticsAlgorithm):
     def is_delete_first_letter(self):
         return self.__delete_first_letter
 
+    def is_cut_result(self):
+        return self.__cut_result
+
+    def is_reduce_word(self):
+        return self.__reduce_word
+
+    def is_delete_zeros(self):
+        return self.__delete_zeros
+
+    def is_code_vowels(self):
+        return self.__code_vowels
+
+    def get_seq_cutted_len(self):
+        return self.__seq_cutted_len
+
+    def _preprocess(self, word, rule_set):
+        """
+        Language specific transcription of a word before coding
+        :param word: string
+        :param rule_set: rules of the algorithm resolved by _rule_set()
+        :return: modified string
+        """
+        return word
+
     def transform(self, word):
-        return self._apply_soundex_algorithm(word)
+        return self._apply_soundex_algorithm(self._preprocess(word, self._rule_set()))
+
+    def transform_batch(self, words):
+        """
+        Converts a batch of words to phonetic codes, coding stages run vectorized over the whole batch
+        (requires numpy), the result is the same as of transform()
+        :param words: list of strings
+        :return: list of string codes
+        """
+        with pinned_bundle():
+            return soundex_transform_batch(self, words)
 
 
 class EnglishSoundex(Soundex):
     """
     This version may have differences from original Soundex for English (consonants was splitted in more groups)
     """
-    __rule_set = EnglishRuleSet()
+    _rule_set_class = EnglishRuleSet
 
     _vowels = EN_VOWELS
     _vowels_table = str.maketrans(_vowels, 'AABBBC')
     _table = str.maketrans('bpfvcksgjqxzdtlmnr', '112233344555667889')
 
     def _replace_vowels_seq(self, word):
-        return self.__rule_set.reduce_phonemes(word)
+        return self._rule_set().reduce_phonemes(word)
 
-    def transform(self, word):
+    def _preprocess(self, word, rule_set):
         word = self._cyrillic2latin(word)
-        word = self.__rule_set.remove_empty_sounds(word)
-        return self._apply_soundex_algorithm(word)
+        word = rule_set.remove_empty_sounds(word)
+        return word
 
 
 class FinnishSoundex(Soundex):
     """
     Soundex for Finnish language
     """
-    __rule_set = FinnishRuleSet()
+    _rule_set_class = FinnishRuleSet
 
     _vowels = FI_VOWELS
     _vowels_table = str.maketrans(_vowels, 'AAABBBCC')
     _table = str.maketrans('bpfvcszkgqdtlmnrj', '11223334445567789')
 
-    def transform(self, word):
+    def _preprocess(self, word, rule_set):
         word = self._cyrillic2latin(word)
-        word = self.__rule_set.reduce_phonemes(word)
-        return self._apply_soundex_algorithm(word)
+        word = rule_set.reduce_phonemes(word)
+        return word
 
 
 class EstonianSoundex(Soundex):
     """
     Soundex for Estonian language
     """
-    __rule_set = EstonianRuleSet()
+    _rule_set_class = EstonianRuleSet
 
     _vowels = EE_VOWELS
     _vowels_table = str.maketrans(_vowels, 'AAABBBBCC')
     _table = str.maketrans('bpfvcszkgqdtlmnrj', '11223334445567789')
 
-    def transform(self, word):
+    def _preprocess(self, word, rule_set):
         word = self._cyrillic2latin(word)
-        word = self.__rule_set.reduce_phonemes(word)
-        return self._apply_soundex_algorithm(word)
+        word = rule_set.reduce_phonemes(word)
+        return word
 
 
 class SwedenSoundex(Soundex):
     """
     Soundex for Sweden language
     """
-    __rule_set = SwedenRuleSet()
+    _rule_set_class = SwedenRuleSet
 
     _vowels = SE_VOWELS
     _vowels_table = str.maketrans(_vowels, 'AABBBBBCC')
     _table = str.maketrans('bpfvcszkgqdtlmnrj', '11223334445567789')
 
-    def transform(self, word):
+    def _preprocess(self, word, rule_set):
         word = self._cyrillic2latin(word)
         if word.endswith('on') and not word.endswith('hon'):
             word = word[:-2] + 'ån'
-        word = self.__rule_set.reduce_phonemes(word)
+        word = rule_set.reduce_phonemes(word)
         word = word.replace('sh', 'z')
         word = word.replace('hf', 'x')
-        return self._apply_soundex_algorithm(word)
+        return word
 
 
 class RussianSoundex(Soundex):
     """
     Soundex for Russian language
     """
+    _rule_set_class = RussianRuleSet
 
     _vowels = RU_VOWELS
     _vowels_table = str.maketrans(_vowels, 'AAAABBBBCC')
@@ -162,7 +212,8 @@ class RussianSoundex(Soundex):
 
     def __init__(self, delete_first_letter=False, delete_first_coded_letter=False, reduce_word=True,
                  delete_zeros=False, cut_result=False, seq_cutted_len=4,
-                 code_vowels=False, reduce_phonemes=True, replace_ego_ogo_endings=False, use_morph_analysis=False):
+                 code_vowels=False, reduce_phonemes=True, replace_ego_ogo_endings=False, use_morph_analysis=False,
+                 use_morph_lookup=True):
         """
         Initialization of Russian Soundex object
         :param delete_first_letter:
@@ -176,45 +227,81 @@ class RussianSoundex(Soundex):
         :param reduce_phonemes: simplify sequences of Russian consonants
         :param replace_ego_ogo_endings: replace "-его/-ого" endings with "-ево/-ово"
         :param use_morph_analysis: use morphological analysis for "-его/-ого" replacement
+        :param use_morph_lookup: resolve frequent closed-class words (pronouns, numerals, adverbs)
+            with a precomputed table before morphological analysis, the table agrees with the analyzer
         """
         super(RussianSoundex, self).__init__(delete_first_letter, delete_first_coded_letter, reduce_word,
                                              delete_zeros, cut_result, seq_cutted_len, code_vowels)
 
         self.reduce_phonemes = reduce_phonemes
-        self.rule_set = RussianRuleSet()
         self.use_morph_analysis = use_morph_analysis
+        self.use_morph_lookup = use_morph_lookup
         self.replace_ego_ogo_endings = True if self.use_morph_analysis else replace_ego_ogo_endings
-        if self.use_morph_analysis:
-            self.__moprh = pymorphy2.MorphAnalyzer()
+        self.__stats = {'words': 0, 'candidates': 0, 'analyzer_calls': 0}
 
-    def __replace_ego_ogo_endings(self, word):
-        is_applicable = True
-        if self.use_morph_analysis:
-            parse = self.__moprh.parse(word)
-            is_applicable = parse and any(pos_tag in parse[0].tag for pos_tag in self.SPEC_ENDING_POSTAGS)
-        return self.rule_set.replace_ego_ogo_ending(word) if is_applicable else word
+    @staticmethod
+    def __lookup_ego_ogo_ending(word):
+        word = word.lower()
+        if word in RU_EGO_OGO_FORMS:
+            return True
+        if word in RU_NOT_EGO_OGO_FORMS:
+            return False
+        return None
+
+    @property
+    def rule_set(self):
+        return self._rule_set()
+
+    def __is_ego_ogo_applicable(self, word, rule_set):
+        stats = self.__stats
+        stats['words'] += 1
+        if not rule_set.has_ego_ogo_ending(word):
+            return False
+        stats['candidates'] += 1
+        if not self.use_morph_analysis:
+            return True
+        if self.use_morph_lookup:
+            is_applicable = self.__lookup_ego_ogo_ending(word)
+            if is_applicable is not None:
+                return is_applicable
+        stats['analyzer_calls'] += 1
+        parse = _morph_analyzer().parse(word)
+        return bool(parse) and any(pos_tag in parse[0].tag for pos_tag in self.SPEC_ENDING_POSTAGS)
+
+    @traced
+    def __replace_ego_ogo_endings(self, word, rule_set):
+        return rule_set.replace_ego_ogo_ending(word) if self.__is_ego_ogo_applicable(word, rule_set) else word
+
+    def get_stats(self):
+        """
+        :return: dict with counters of "-его/-ого" processing and the share of words passed to the analyzer
+        """
+        stats = dict(self.__stats)
+        stats['analyzer_call_ratio'] = stats['analyzer_calls'] / stats['words'] if stats['words'] else 0.0
+        return stats
 
     def _replace_vowels_seq(self, word):
-        word = self.rule_set.replace_ii_ending(word)
-        word = self.rule_set.replace_ia_ending(word)
+        rule_set = self._rule_set()
+        word = rule_set.replace_ii_ending(word)
+        word = rule_set.replace_ia_ending(word)
         return word
 
-    def _reduce_phonemes(self, word):
-        word = self.rule_set.replace_consonant_vowels(word)
-        word = self.rule_set.replace_j_vowel_phonemes(word)
-        word = self.rule_set.reduce_phonemes(word)
+    def _reduce_phonemes(self, word, rule_set):
+        word = rule_set.replace_consonant_vowels(word)
+        word = rule_set.replace_j_vowel_phonemes(word)
+        word = rule_set.reduce_phonemes(word)
         return word
 
-    def transform(self, word):
+    def _preprocess(self, word, rule_set):
         """
-        Transforms a word into a sequence with coded phonemes
+        Transcripts a word into a sequence of Russian phonemes
         :param word: string
-        :return: Soundex string code
+        :param rule_set: RussianRuleSet object
+        :return: modified string
         """
         word = self._latin2cyrillic(word)
         if self.replace_ego_ogo_endings:
-            word = self.__replace_ego_ogo_endings(word)
+            word = self.__replace_ego_ogo_endings(word, rule_set)
         if self.reduce_phonemes:
-            word = self._reduce_phonemes(word)
-        word = self.rule_set.replace_j_and_signs(word)
-        return self._apply_soundex_algorithm(word)
+            word = self._reduce_phonemes(word, rule_set)
+        return rule_set.replace_j_and_signs(word)
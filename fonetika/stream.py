@@ -0,0 +1,111 @@
+import time
+
+from collections import OrderedDict
+
+from .base.base import BasePhoneticsAlgorithm
+from .bundle import active_bundle
+
+
+class StreamingEncoder:
+    """
+    Encoder stage for highly repetitive word streams (log lines, form submissions).
+    Keeps a bounded rolling window of recently seen words and calls the underlying
+    algorithm only for words which are not in the window
+    """
+    def __init__(self, phonetics, window_size=10000, window_seconds=None, metrics=None):
+        """
+        Init a streaming encoder
+        :param phonetics: an object of BasePhoneticsAlgorithm class
+        :param window_size: max number of words kept in the window (memory budget)
+        :param window_seconds: forget words which were not seen during this time, optional
+        :param metrics: an EncodingMetrics object, window hits are counted as cache hits, optional
+        """
+        assert isinstance(phonetics, BasePhoneticsAlgorithm)
+        assert window_size > 0
+        assert window_seconds is None or window_seconds > 0
+        self.phonetics = phonetics
+        self.window_size = window_size
+        self.window_seconds = window_seconds
+        self.metrics = metrics
+        self.__window = OrderedDict()
+        self.__bundle = active_bundle()
+        self.__hits = 0
+        self.__misses = 0
+
+    def __expire(self, now):
+        window, deadline = self.__window, now - self.window_seconds
+        while window:
+            if next(iter(window.values()))[1] >= deadline:
+                break
+            window.popitem(last=False)
+
+    def transform(self, word):
+        """
+        Converts a given word to phonetic code, repeated words are taken from the window
+        :param word: string
+        :return: string code
+        """
+        window = self.__window
+        if active_bundle() is not self.__bundle:
+            # codes of the window were produced by replaced rules
+            window.clear()
+            self.__bundle = active_bundle()
+        now = time.monotonic() if self.window_seconds else 0
+        if self.window_seconds:
+            self.__expire(now)
+
+        entry = window.get(word)
+        if entry is not None:
+            window[word] = entry[0], now
+            window.move_to_end(word)
+            self.__hits += 1
+            if self.metrics is not None:
+                self.metrics.count_hits(self.phonetics)
+            return entry[0]
+
+        if self.metrics is None:
+            code = self.phonetics.transform(word)
+        else:
+            self.metrics.count_misses()
+            code = self.metrics.observe(self.phonetics, word, self.phonetics.transform)
+        window[word] = code, now
+        if len(window) > self.window_size:
+            window.popitem(last=False)
+        self.__misses += 1
+        return code
+
+    def transform_stream(self, words):
+        """
+        Lazily converts a stream of words to phonetic codes
+        :param words: iterable of strings
+        :return: generator of string codes
+        """
+        for word in words:
+            yield self.transform(word)
+
+    def dedup_ratio(self):
+        """
+        :return: share of words which were served from the window
+        """
+        total = self.__hits + self.__misses
+        return self.__hits / total if total else 0.0
+
+    def get_stats(self):
+        """
+        :return: dict with counters of the stage
+        """
+        return {
+            'words': self.__hits + self.__misses,
+            'hits': self.__hits,
+            'misses': self.__misses,
+            'window': len(self.__window),
+            'dedup_ratio': self.dedup_ratio()
+        }
+
+    def reset(self):
+        """
+        Clears the window and counters
+        """
+        self.__window.clear()
+        self.__hits = 0
+        self.__misses = 0
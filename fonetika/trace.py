@@ -0,0 +1,178 @@
+import contextvars
+import functools
+
+from collections import namedtuple
+from time import perf_counter
+
+
+_active_trace = contextvars.ContextVar('fonetika_trace', default=None)
+
+TraceStep = namedtuple('TraceStep', ['stage', 'rule', 'before', 'after', 'elapsed', 'depth'])
+
+
+def active_trace():
+    """
+    :return: trace of the word which is being transformed in the current context or None
+    """
+    return _active_trace.get()
+
+
+class EncodingTrace:
+    """
+    Intermediate strings of a word after each stage and each substitution rule
+    """
+    def __init__(self, word):
+        self.word = word
+        self.code = None
+        self.elapsed = 0.0
+        self.steps = []
+        self.__depth = 0
+
+    def enter(self, stage, before):
+        self.steps.append(TraceStep(stage, None, before, None, 0.0, self.__depth))
+        self.__depth += 1
+        return len(self.steps) - 1
+
+    def leave(self, idx, after, elapsed):
+        self.__depth -= 1
+        self.steps[idx] = self.steps[idx]._replace(after=after, elapsed=elapsed)
+
+    def add_rule(self, stage, rule, before, after, elapsed):
+        self.steps.append(TraceStep(stage, rule, before, after, elapsed, self.__depth))
+
+    def applied_rules(self):
+        """
+        :return: rule steps which changed the word
+        """
+        return [step for step in self.steps if step.rule is not None and step.before != step.after]
+
+    def slowest(self, n=5):
+        """
+        :return: n slowest rule steps
+        """
+        return sorted((step for step in self.steps if step.rule is not None), key=lambda s: -s.elapsed)[:n]
+
+    def format(self, max_len=40):
+        """
+        Human readable representation of the trace
+        :param max_len: long intermediate strings are shortened to this length
+        :return: string
+        """
+        def short(seq):
+            return seq if len(seq) <= max_len else f'{seq[:max_len]}...({len(seq)})'
+
+        lines = [f'{short(self.word)} -> {short(self.code)}, {self.elapsed * 1e6:.1f}us']
+        for step in self.steps:
+            if step.rule is not None and step.before == step.after:
+                continue
+            name = step.stage if step.rule is None else f'{step.stage}: {step.rule}'
+            lines.append(f'{"  " * (step.depth + 1)}{name} [{step.elapsed * 1e6:.1f}us] '
+                         f'{short(step.before)} -> {short(step.after)}')
+        return '\n'.join(lines)
+
+    def __str__(self):
+        return self.format()
+
+
+_STAGE, _RULES = 'stage', 'rules'
+
+_traced_classes = {}
+
+
+def traced(func):
+    """
+    Marks a stage method (self, word, *args), its calls are recorded into traces. The method itself is not wrapped,
+    only traced subclasses made by trace_transform() record calls, so encoding without a trace doesn't pay for it
+    """
+    func.trace_kind = _STAGE
+    return func
+
+
+def traced_rules(func):
+    """
+    Marks a method (self, word, rules) which applies substitution rules, every rule is recorded into traces
+    """
+    func.trace_kind = _RULES
+    return func
+
+
+def _record_stage(func):
+    stage = func.__qualname__
+
+    @functools.wraps(func)
+    def wrapper(self, word, *args):
+        trace = _active_trace.get()
+        if trace is None:
+            return func(self, word, *args)
+        idx = trace.enter(stage, word)
+        start = perf_counter()
+        result = func(self, word, *args)
+        trace.leave(idx, result, perf_counter() - start)
+        return result
+    return wrapper
+
+
+def _record_rules(self, word, rules):
+    trace = _active_trace.get()
+    stage = type(self).__name__
+    for replace, result in rules:
+        start = perf_counter()
+        new_word = replace.sub(result, word)
+        if trace is not None:
+            trace.add_rule(stage, f'{replace.pattern} -> {result}', word, new_word, perf_counter() - start)
+        word = new_word
+    return word
+
+
+def _traced_class(cls):
+    """
+    Subclass which records calls of marked methods of a class, an algorithm subclass uses a traced rule set too
+    :param cls: class of an algorithm or a rule set
+    :return: class with the same name
+    """
+    traced_cls = _traced_classes.get(cls)
+    if traced_cls is None:
+        namespace = {'__qualname__': cls.__qualname__, '__module__': cls.__module__}
+        for name in dir(cls):
+            value = getattr(cls, name, None)
+            kind = getattr(value, 'trace_kind', None)
+            if kind == _STAGE:
+                namespace[name] = _record_stage(value)
+            elif kind == _RULES:
+                namespace[name] = _record_rules
+        if getattr(cls, '_rule_set_class', None) is not None:
+            namespace['_rule_set_class'] = _traced_class(cls._rule_set_class)
+        traced_cls = _traced_classes[cls] = type(cls)(cls.__name__, (cls,), namespace)
+    return traced_cls
+
+
+def trace_transform(phonetics, word):
+    """
+    Transforms a word and records every intermediate string with timings. The word is encoded by a view
+    of the algorithm of a traced subclass, the view shares all attributes with the algorithm
+    :param phonetics: an object of BasePhoneticsAlgorithm class
+    :param word: string
+    :return: EncodingTrace object
+    """
+    view = object.__new__(_traced_class(type(phonetics)))
+    view.__dict__ = phonetics.__dict__
+    trace = EncodingTrace(word)
+    token = _active_trace.set(trace)
+    try:
+        start = perf_counter()
+        trace.code = view.transform(word)
+        trace.elapsed = perf_counter() - start
+    finally:
+        _active_trace.reset(token)
+    return trace
+
+
+class TraceEncoder:
+    """
+    Debug wrapper for an algorithm, transform() returns a trace instead of a bare code
+    """
+    def __init__(self, phonetics):
+        self.phonetics = phonetics
+
+    def transform(self, word):
+        return trace_transform(self.phonetics, word)
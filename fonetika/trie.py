@@ -0,0 +1,100 @@
+from .base.base import BasePhoneticsAlgorithm
+from .index import check_rules_version
+from .ruleset import rules_version
+from .soundex import Soundex
+
+
+class _TrieNode:
+    __slots__ = ('children', 'top')
+
+    def __init__(self):
+        self.children = {}
+        self.top = []
+
+
+class PhoneticTrie:
+    """
+    Prefix tree over phonetic codes for autocomplete-as-you-type search.
+    Every node keeps the most frequent words of its subtree, so a completion
+    is a walk along the code of the typed prefix
+    """
+    def __init__(self, phonetics, top_k=10):
+        """
+        Init a phonetic prefix tree
+        :param phonetics: an object of BasePhoneticsAlgorithm class, Soundex should not cut codes
+        :param top_k: max number of completions stored in every node
+        """
+        assert isinstance(phonetics, BasePhoneticsAlgorithm)
+        assert not (isinstance(phonetics, Soundex) and phonetics.is_cut_result())
+        assert top_k > 0
+        self.phonetics = phonetics
+        self.top_k = top_k
+        self.__root = _TrieNode()
+        self.__counts = {}
+        self.__rules_version = rules_version()
+
+    def __update_top(self, node, word, count):
+        top = [item for item in node.top if item[1] != word]
+        top.append((-count, word))
+        top.sort()
+        node.top = top[:self.top_k]
+
+    def add(self, word, count=1):
+        """
+        Adds a word or increases its frequency
+        :param word: string
+        :param count: frequency increment
+        """
+        self.__rules_version = check_rules_version(self.__rules_version, not self.__counts)
+        total = self.__counts.get(word, 0) + count
+        self.__counts[word] = total
+        node = self.__root
+        self.__update_top(node, word, total)
+        for symbol in self.phonetics.transform(word):
+            node = node.children.setdefault(symbol, _TrieNode())
+            self.__update_top(node, word, total)
+
+    def add_many(self, words):
+        """
+        :param words: iterable of strings or (string, frequency) pairs
+        """
+        for word in words:
+            if isinstance(word, tuple):
+                self.add(*word)
+            else:
+                self.add(word)
+
+    def __find(self, code):
+        node = self.__root
+        for symbol in code:
+            node = node.children.get(symbol)
+            if node is None:
+                return None
+        return node
+
+    def complete(self, prefix, limit=None):
+        """
+        Finds sounds-alike completions of a partially typed word.
+        The last symbol of a prefix code may differ from the full code (e.g. a deafened
+        final consonant), so the search backs off by one symbol if nothing is found
+        :param prefix: string
+        :param limit: max number of completions, not more than top_k
+        :return: list of words ranked by frequency
+        """
+        self.__rules_version = check_rules_version(self.__rules_version, not self.__counts)
+        code = self.phonetics.transform(prefix)
+        node = self.__find(code)
+        if node is None and len(code) > 1:
+            node = self.__find(code[:-1])
+        if node is None:
+            return []
+        return [word for _, word in node.top[:limit]]
+
+    def count(self, word):
+        return self.__counts.get(word, 0)
+
+    def __len__(self):
+        return len(self.__counts)
+
+    def __contains__(self, word):
+        return word in self.__counts
@@ -1,6 +1,25 @@
-from setuptools import setup, find_packages
+from setuptools import setup, find_packages, Extension
+from setuptools.command.build_ext import build_ext
 from os.path import join, dirname
 
+
+class OptionalBuildExt(build_ext):
+    """
+    The compiled accelerator is optional, pure Python implementations are used if it can't be built
+    """
+    def run(self):
+        try:
+            super().run()
+        except Exception as e:
+            print(f'WARNING: fonetika accelerator is not built, pure Python backend will be used ({e})')
+
+    def build_extension(self, ext):
+        try:
+            super().build_extension(ext)
+        except Exception as e:
+            print(f'WARNING: {ext.name} is not built, pure Python backend will be used ({e})')
+
+
 setup(
     name='fonetika',
     version='1.5.1',
@@ -9,8 +28,11 @@ setup(
     author_email='drodionova86@gmail.com',
     license='MIT',
     packages=find_packages(),
+    ext_modules=[Extension('fonetika._speedups', [join('fonetika', '_speedups.c')])],
+    cmdclass={'build_ext': OptionalBuildExt},
     description='Phonetics algorithms (Soundex and Metaphone) for russian, english, sweden, finnish and estonian languages',
     long_description=open(join(dirname(__file__), 'README.md')).read(), install_requires=['pymorphy2', 'editdistance'],
+    extras_require={'numpy': ['numpy']},
     long_description_content_type="text/markdown",
     classifiers=[
         'Intended Audience :: Developers',
@@ -0,0 +1,40 @@
+import random
+
+import pytest
+
+from fonetika import accel
+from fonetika.config import EN_DEAF_CONSONANTS, EN_VOWELS, RU_DEAF_CONSONANTS, RU_VOWELS
+
+
+random.seed(0)
+alphabet = 'aAbBdgqvzeiouyдДзвгбаяоыиеёэюуЁлмнр0_- İıKk'
+accel_words = ['', 'a', 'aA', 'ıIİi', 'aa--bb__cc', 'шварцнеггер', 'Швардснеггер'] + \
+    [''.join(random.choice(alphabet) for _ in range(random.randint(1, 12))) for _ in range(5000)]
+
+backends = [accel.py_reduce_seq, accel.py_deaf_consonants, accel.py_translate_vowels, accel.py_hamming]
+if accel._speedups is not None:
+    backends = [backends, [accel._speedups.reduce_seq, accel._speedups.deaf_consonants,
+                           accel._speedups.translate_vowels, accel._speedups.hamming]]
+else:
+    backends = [backends]
+
+
+def _reference_deaf_consonants(word, deaf_seq, deaf_result, criteria):
+    table = str.maketrans(deaf_seq, deaf_result)
+    return ''.join(letter.translate(table) if letter in deaf_seq and
+                   (i == len(word) - 1 or word[i + 1].lower() not in criteria) else letter
+                   for i, letter in enumerate(word))
+
+
+@pytest.mark.parametrize('reduce_seq, deaf_consonants, translate_vowels, hamming', backends)
+def test_accel_backends(reduce_seq, deaf_consonants, translate_vowels, hamming):
+    for word in accel_words:
+        assert reduce_seq(word) == accel._reduce_regex.sub(r'\1', word)
+        assert translate_vowels(word, RU_VOWELS) == ''.join('0' if c in RU_VOWELS else c for c in word)
+        for deaf_seq, deaf_result, criteria in [(EN_DEAF_CONSONANTS, 'tkkfs', EN_VOWELS),
+                                                (RU_DEAF_CONSONANTS, 'пстфк', 'лмнр' + RU_VOWELS),
+                                                (RU_DEAF_CONSONANTS, 'пстфк', '')]:
+            expected = _reference_deaf_consonants(word, deaf_seq, deaf_result, criteria)
+            assert deaf_consonants(word, deaf_seq, deaf_result, criteria) == expected
+        other = word[::-1]
+        assert hamming(word, other) == sum(a != b for a, b in zip(word, other))
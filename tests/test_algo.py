@@ -1,5 +1,13 @@
+import itertools
+import random
+import re
+
+import pytest
+
+from fonetika.config import RU_EGO_OGO_FORMS, RU_NOT_EGO_OGO_FORMS
 from fonetika.soundex import RussianSoundex, FinnishSoundex, SwedenSoundex
-from fonetika.metaphone import RussianMetaphone, EnglishMetaphone, FinnishMetaphone, SwedenMetaphone
+from fonetika.metaphone import RussianMetaphone, EnglishMetaphone, FastEnglishMetaphone, FinnishMetaphone, SwedenMetaphone
+from fonetika.ruleset import merge_rules
 
 
 metaphone_params = [
@@ -244,3 +252,55 @@ def test_sweden_soundex():
     soundex = SwedenSoundex(delete_first_coded_letter=True, code_vowels=True)
     for data, expected in soundex_sweden_params:
         assert soundex.transform(data) == expected
+
+
+def test_shared_rule_sets():
+    assert RussianSoundex().rule_set is RussianMetaphone().rule_set
+    assert isinstance(RussianSoundex().rule_set._replacement_phoneme_map(), tuple)
+
+
+def test_soundex_morph_stats():
+    soundex = RussianSoundex(use_morph_analysis=True)
+    for data, expected in soundex_morph_params:
+        assert soundex.transform(data) == expected
+    assert soundex.transform('много') == RussianSoundex().transform('много')
+    assert soundex.transform('его') == RussianSoundex(replace_ego_ogo_endings=True).transform('его')
+    stats = soundex.get_stats()
+    assert stats['words'] == 6 and stats['candidates'] == 4
+    assert stats['analyzer_calls'] == 2 and stats['analyzer_call_ratio'] == 2 / 6
+
+
+def test_soundex_morph_lookup():
+    soundex, analyzer_soundex = RussianSoundex(use_morph_analysis=True), \
+        RussianSoundex(use_morph_analysis=True, use_morph_lookup=False)
+    words = sorted(RU_EGO_OGO_FORMS | RU_NOT_EGO_OGO_FORMS) + ['Достоевского', 'Толстого', 'живущего', 'абонирующего']
+    for word in words + [word.capitalize() for word in words]:
+        assert soundex.transform(word) == analyzer_soundex.transform(word)
+    assert analyzer_soundex.get_stats()['analyzer_calls'] == 2 * len(words)
+
+
+def test_fast_english_metaphone():
+    random.seed(0)
+    letters = 'abcdefghijklmnopqrstuvwxyz'
+    words = [''.join(chars) for chars in itertools.product(letters, repeat=2)]
+    words += [''.join(random.choice(letters + letters.upper()) for _ in range(random.randint(1, 12)))
+              for _ in range(20000)]
+    words += ['knight', 'school', 'wright', 'lamb', 'judge', 'ghost', 'signed', 'whale', 'phone', 'Hugh']
+    for options in [{}, {'reduce_vowels': True}, {'reduce_word': False}]:
+        metaphone, fast_metaphone = EnglishMetaphone(**options), FastEnglishMetaphone(**options)
+        for word in words:
+            assert fast_metaphone.transform(word) == metaphone.transform(word)
+
+
+def test_merge_rules():
+    rules = [(re.compile('Q'), 'k'), (re.compile('(?i)z'), 's'), (re.compile(r'(a)(b)'), r'\g<0>-\2\1'),
+             (re.compile(r'(?P<x>c)(d)'), r'[\g<x>\\\2]'), (re.compile('(e)(f)(g)(h)(i)(j)(k)(l)(m)(n)'), r'\10\1'),
+             (re.compile(r'(?<=x)(y)(w)?'), r'<\2>')]
+    pattern, replace = merge_rules(rules)
+    for word in ['aqeQZz', 'abcdab', 'efghijklmn', 'xyxywE']:
+        expected = word
+        for rule, result in rules:
+            expected = rule.sub(result, expected)
+        assert pattern.sub(replace, word) == expected
+    with pytest.raises(AssertionError):
+        merge_rules([(re.compile(r'(x)\1'), 'y')])
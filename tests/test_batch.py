@@ -0,0 +1,25 @@
+import pytest
+
+from fonetika.soundex import RussianSoundex, EnglishSoundex, FinnishSoundex, EstonianSoundex, SwedenSoundex
+
+pytest.importorskip('numpy')
+
+batch_words = ['йолочка', 'ёлочка', 'рентген', 'выборгский', 'щастье', 'кoрован', 'голландцы', 'бухгалтер',
+               'жёстче', 'rungot', 'shamaani', 'yö', 'maalaatte', 'kött', 'sju', 'och', 'skjorta', 'flicka',
+               '', 'Aa', 'İstanbul', 'straße', 'breakfast', 'x' * 30]
+
+batch_options = [
+    {},
+    {'delete_first_coded_letter': True, 'code_vowels': True},
+    {'delete_first_letter': True, 'reduce_word': False},
+    {'delete_zeros': True, 'cut_result': True},
+    {'cut_result': True, 'seq_cutted_len': 6, 'delete_first_coded_letter': True}
+]
+
+
+def test_soundex_batch():
+    for cls in [RussianSoundex, EnglishSoundex, FinnishSoundex, EstonianSoundex, SwedenSoundex]:
+        for options in batch_options:
+            soundex = cls(**options)
+            assert soundex.transform_batch(batch_words) == [soundex.transform(word) for word in batch_words]
+    assert RussianSoundex().transform_batch([]) == []
@@ -0,0 +1,113 @@
+import json
+import re
+
+import pytest
+
+from fonetika.bundle import RuleBundle, RuleBundleException, activate_bundle, active_bundle, pinned_bundle, \
+    reload_bundle
+from fonetika.metaphone import EnglishMetaphone, FastEnglishMetaphone, RussianMetaphone
+from fonetika.ruleset import rules_version
+from fonetika.soundex import RussianSoundex
+from fonetika.stream import StreamingEncoder
+
+
+dialect_rules = dict(RU_REMOVE_MAP=[(re.compile(r'й', re.I), ''), (re.compile(r'[ъь]', re.I), '')])
+
+
+def test_bundle_export(tmp_path):
+    path = tmp_path / 'rules.json'
+    bundle = RuleBundle.from_config()
+    assert bundle.version == rules_version()
+    bundle.export(path)
+    loaded = RuleBundle.load(path)
+    assert loaded.version == bundle.version
+    for name in bundle.names():
+        assert loaded[name] == bundle[name]
+
+    dialect = bundle.replace(**dialect_rules)
+    assert dialect.version != bundle.version
+    dialect.export(path)
+    assert RuleBundle.load(path).version == dialect.version
+
+    data = json.loads(path.read_text(encoding='utf-8'))
+    data['rules']['RU_REMOVE_MAP']['rules'][0][2] = 'j'
+    path.write_text(json.dumps(data), encoding='utf-8')
+    with pytest.raises(RuleBundleException):
+        RuleBundle.load(path)
+
+
+def test_bundle_hot_reload(tmp_path):
+    path = tmp_path / 'rules.json'
+    RuleBundle.from_config().replace(**dialect_rules).export(path)
+    metaphone, soundex = RussianMetaphone(), RussianSoundex()
+    encoder = StreamingEncoder(metaphone)
+    words = ['майка', 'йогурт', 'шварцнегер']
+    old_codes, old_version = metaphone.transform_many(words), rules_version()
+    assert encoder.transform('майка') == old_codes[0]
+
+    previous = reload_bundle(path)
+    try:
+        new_codes = metaphone.transform_many(words)
+        assert new_codes[0] != old_codes[0] and new_codes[2] == old_codes[2]
+        assert rules_version() != old_version
+        assert encoder.transform('майка') == new_codes[0]
+        with pinned_bundle():
+            activate_bundle(previous)
+            assert metaphone.transform('майка') == new_codes[0]
+        assert metaphone.transform('майка') == old_codes[0]
+    finally:
+        activate_bundle(previous)
+    assert active_bundle() is previous
+    assert soundex.transform('майка') == RussianSoundex().transform('майка')
+
+
+def test_bundle_metaphone_passes():
+    words = ['knight', 'school', 'thumb', 'wright']
+    metaphone = FastEnglishMetaphone()
+    expected = metaphone.transform_many(words)
+    previous = activate_bundle(active_bundle().replace(EN_METAPHONE_PASSES=(1, 2)))
+    try:
+        assert metaphone.transform_many(words) == expected
+    finally:
+        activate_bundle(previous)
+
+
+def test_bundle_edited_metaphone_phonemes():
+    rules = [(rule, 'sch' if rule.pattern == 'mb$' else result)
+             for rule, result in active_bundle()['EN_METAPHONE_PHONEMES']]
+    rules += [(re.compile('Q'), 'k'), (re.compile(r'(x)\1'), 'ks')]
+    words = ['lamb', 'thumb', 'knight', 'school', 'aqe', 'aQe', 'axxe']
+    fast, slow = FastEnglishMetaphone(), EnglishMetaphone()
+    previous = activate_bundle(active_bundle().replace(EN_METAPHONE_PHONEMES=rules))
+    try:
+        assert not active_bundle().is_shipped('EN_METAPHONE_PHONEMES')
+        assert fast.transform_many(words) == slow.transform_many(words)
+        assert fast.transform('lamb') != FastEnglishMetaphone().transform('lam')
+        assert fast.transform('aqe') != fast.transform('aQe')
+    finally:
+        activate_bundle(previous)
+    assert active_bundle().is_shipped('EN_METAPHONE_PHONEMES', 'EN_METAPHONE_PASSES')
+
+
+class _SwappingSoundex(RussianSoundex):
+    """
+    Activates another bundle in the middle of transform()
+    """
+    def __init__(self, bundle):
+        super().__init__()
+        self.bundle = bundle
+        self.previous = None
+
+    def _preprocess(self, word, rule_set):
+        self.previous = activate_bundle(self.bundle)
+        return super()._preprocess(word, rule_set)
+
+
+def test_bundle_swap_during_transform():
+    soundex = _SwappingSoundex(active_bundle().replace(**dialect_rules))
+    expected = RussianSoundex().transform('майка')
+    try:
+        assert soundex.transform('майка') == expected
+        assert RussianSoundex().transform('майка') != expected
+    finally:
+        activate_bundle(soundex.previous)
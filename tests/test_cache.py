@@ -0,0 +1,33 @@
+from fonetika import cache as cache_module
+from fonetika.cache import EncodingCache
+from fonetika.policy import InputPolicy
+from fonetika.soundex import RussianSoundex
+from fonetika.metaphone import RussianMetaphone
+
+
+nightly_words = ['Иванов', 'Петров', 'Иванов', 'Сидорова', 'Шварцнеггер']
+
+
+def test_encoding_cache(tmp_path):
+    path = tmp_path / 'codes.sqlite'
+    soundex, metaphone = RussianSoundex(code_vowels=True), RussianMetaphone()
+    expected = [soundex.transform(word) for word in nightly_words]
+    with EncodingCache(path, soundex) as cache:
+        assert soundex.transform_many(nightly_words, cache=cache) == expected
+        assert len(cache) == 4
+    with EncodingCache(path, soundex) as cache, EncodingCache(path, metaphone) as other_cache:
+        assert cache.get_many(['Иванов', 'Смирнов']) == {'Иванов': soundex.transform('Иванов')}
+        assert len(other_cache) == 0
+        policy = InputPolicy(empty_code='-')
+        assert soundex.transform_many(['Петров!', None], policy=policy, cache=cache) == [expected[1], '-']
+
+
+def test_encoding_cache_invalidation(tmp_path, monkeypatch):
+    path = tmp_path / 'codes.sqlite'
+    soundex = RussianSoundex()
+    with EncodingCache(path, soundex) as cache:
+        soundex.transform_many(nightly_words, cache=cache)
+    monkeypatch.setattr(cache_module, 'rules_version', lambda: 'changed')
+    with EncodingCache(path, soundex) as cache:
+        assert len(cache) == 0
+        assert cache.get_many(nightly_words) == {}
@@ -0,0 +1,37 @@
+from fonetika.dedup import SortedNeighbourhood
+from fonetika.distance import PhoneticsInnerLanguageDistance
+from fonetika.metaphone import RussianMetaphone
+from fonetika.soundex import RussianSoundex
+
+
+dedup_words = ['шварцнеггер', 'ёлочка', 'рентген', 'шворцнегер', 'арнольд', 'йолочка', 'швардснеггер', 'рингтон']
+
+
+def test_sorted_neighbourhood():
+    soundex = RussianSoundex(delete_first_letter=True)
+    dedup = SortedNeighbourhood([RussianMetaphone(), soundex], PhoneticsInnerLanguageDistance(soundex), window=3)
+    clusters = list(dedup.clusters(dedup_words))
+    assert clusters == [0, 1, 2, 0, 4, 1, 0, 2]
+    assert dedup.get_stats()['spills'] == 0
+
+    spilling_dedup = SortedNeighbourhood([RussianMetaphone(), soundex], PhoneticsInnerLanguageDistance(soundex),
+                                         window=3, chunk_size=3)
+    assert list(spilling_dedup.clusters(iter(dedup_words))) == clusters
+    stats = spilling_dedup.get_stats()
+    assert stats['spills'] == 3
+    assert stats['records'] == len(dedup_words)
+    assert stats['duplicates'] == 4
+
+
+def test_sorted_neighbourhood_window():
+    dedup = SortedNeighbourhood([RussianSoundex()], max_distance=0, window=2)
+    assert list(dedup.clusters(['ёлочка', 'йолочка', 'ёлочка'])) == [0, 0, 0]
+    assert list(dedup.clusters([])) == []
+
+
+def test_sorted_neighbourhood_line_breaks():
+    words = ['иван', 'ив\rан', 'петр', 'пётр', 'иван', 'ив ан\x0c']
+    expected = list(SortedNeighbourhood([RussianSoundex()]).clusters(words))
+    dedup = SortedNeighbourhood([RussianSoundex()], chunk_size=2)
+    assert list(dedup.clusters(words)) == expected
+    assert dedup.get_stats()['spills'] == 3
@@ -1,6 +1,7 @@
 from fonetika.soundex import RussianSoundex
 from fonetika.metaphone import RussianMetaphone, FinnishMetaphone, EstonianMetaphone
-from fonetika.distance import PhoneticsInnerLanguageDistance, PhoneticsBetweenLanguagesDistance
+from fonetika.distance import PhoneticsDistance, PhoneticsInnerLanguageDistance, PhoneticsBetweenLanguagesDistance, \
+    PhoneticsWeightedDistance, SubstitutionCosts
 
 metaphone_params = [
     (('шварцнегер', 'Швардснеггер'), 0),
@@ -45,3 +46,54 @@ def test_metaphone_between_languages():
     distancer = PhoneticsBetweenLanguagesDistance(meta1, meta2, metric_name='hamming')
     for data, expected in finest_params:
         assert distancer.distance(*data) == expected
+
+
+def test_bounded_distance():
+    metaphone = RussianMetaphone(reduce_phonemes=True)
+    distancer = PhoneticsInnerLanguageDistance(metaphone)
+    for data, expected in metaphone_params:
+        assert distancer.distance(*data, max_distance=1) == expected
+        assert distancer.distance(*data, max_distance=0) == min(expected, 1)
+    assert distancer.distance('шварцнегер', 'полночь', max_distance=2) == 3
+
+
+def test_banded_levenstein():
+    codes = ['ШВАРЦНИГИР', 'ШВАРЦНИКИР', 'ФИСИНАJА', 'ВИСИНАJА', 'ПАЛНАЧ', 'JАГУРТ', '', 'А']
+    for code1 in codes:
+        for code2 in codes:
+            for max_distance in range(4):
+                expected = min(PhoneticsDistance._levenstein(code1, code2), max_distance + 1)
+                assert PhoneticsDistance._banded_levenstein(code1, code2, max_distance) == expected
+                assert PhoneticsDistance._bounded_levenstein(code1, code2, max_distance) == expected
+            for max_distance in (0.5, 1.5, 2.5):
+                distance = PhoneticsDistance._levenstein(code1, code2)
+                expected = distance if distance <= max_distance else max_distance + 1
+                assert PhoneticsDistance._banded_levenstein(code1, code2, max_distance) == expected
+                assert PhoneticsDistance._bounded_levenstein(code1, code2, max_distance) == expected
+
+
+def test_weighted_distance():
+    distancer = PhoneticsWeightedDistance(RussianMetaphone(reduce_phonemes=True))
+    assert distancer.distance('зуд', 'суд') == 0.75
+    assert distancer.distance('шварцнегер', 'Швардснеггер') == 0
+    assert distancer.distance('сад', 'суд') == 0.5
+    assert distancer.distance_many('суд', ['зуд', 'сот', 'полночь'], max_distance=1) == [0.75, 0.5, 2]
+
+
+def test_weighted_soundex_costs():
+    costs = SubstitutionCosts.for_algorithm(RussianSoundex(code_vowels=True))
+    assert costs.cost('A', 'B') == 0.5
+    assert costs.cost('1', '2') == 0.75
+    assert costs.cost('1', '3') == costs.cost('J', '1') == 1.0
+    assert costs.distance('1A2', '2A2') == 0.75
+
+
+def test_weighted_distance_many():
+    distancer = PhoneticsWeightedDistance(RussianSoundex(code_vowels=True))
+    words = ['шварцнегер', 'Швардснеггер', 'зуд', 'суд', 'сад', 'полночь', 'ёлочка', 'йолочка', 'x', ''] * 3
+    codes = [distancer.code(word) for word in words]
+    for word in words[:10]:
+        for max_distance in [None, 0, 1, 2.5]:
+            expected = [distancer.distance(word, other, max_distance) for other in words]
+            assert distancer.distance_many(word, codes=codes, max_distance=max_distance) == expected
+            assert distancer.distance_many(word, words[:5], max_distance) == expected[:5]
@@ -0,0 +1,54 @@
+import pytest
+
+from fonetika.fullname import CYRILLIC, LATIN, FullNameEncoder, detect_script
+from fonetika.metaphone import FinnishMetaphone
+from fonetika.policy import InputPolicy
+from fonetika.soundex import RussianSoundex
+
+
+full_names = ['Иванов Иван Иванович', 'Järvinen Matti', 'Петров-Водкин Кузьма', '', 'Ivanov Ivan', 'Сидоров  Ahti']
+
+
+@pytest.mark.parametrize('token, script', [
+    ('иванов', CYRILLIC), ('järvinen', LATIN), ('Matti', LATIN), ('Aхмед', CYRILLIC), ('Cop', None), ('сор', None)
+])
+def test_detect_script(token, script):
+    assert detect_script(token) == script
+
+
+def test_full_name_encoder():
+    soundex, metaphone = RussianSoundex(), FinnishMetaphone()
+    expected = [
+        ' '.join(soundex.transform(t) for t in ['иванов', 'иван', 'иванович']),
+        ' '.join(metaphone.transform(t) for t in ['järvinen', 'matti']),
+        ' '.join(soundex.transform(t) for t in ['петров', 'водкин', 'кузьма']),
+        '',
+        ' '.join(metaphone.transform(t) for t in ['ivanov', 'ivan']),
+        ' '.join([soundex.transform('сидоров'), metaphone.transform('ahti')]),
+    ]
+    for batch_size in [1, 2, 1024]:
+        encoder = FullNameEncoder({CYRILLIC: soundex, LATIN: metaphone}, batch_size=batch_size)
+        assert list(encoder.transform_stream(full_names)) == expected
+    assert encoder.transform(full_names[0]) == expected[0]
+
+
+def test_full_name_encoder_ambiguous_tokens():
+    soundex = RussianSoundex()
+    encoder = FullNameEncoder({CYRILLIC: soundex, LATIN: FinnishMetaphone()}, sort_tokens=True)
+    assert encoder.transform('Сор Иван') == ' '.join(sorted([soundex.transform('сор'), soundex.transform('иван')]))
+    assert encoder.transform('Иван Сор') == encoder.transform('Сор Иван')
+
+
+def test_full_name_encoder_policy():
+    encoder = FullNameEncoder({CYRILLIC: RussianSoundex(), LATIN: FinnishMetaphone()})
+    keys = encoder.transform_many(full_names)
+    assert encoder.transform_many(full_names, policy=InputPolicy()) == keys
+    assert ' ' in encoder.transform_many(['Иванов Иван'], policy=InputPolicy())[0]
+
+    policy = InputPolicy(max_length=8, truncate=False, empty_code='-', reject_code='!')
+    assert encoder.transform_many(['Иванов Константинович', '', None], policy=policy) == [
+        encoder.transform('Иванов') + ' !', '-', '-'
+    ]
+    assert policy.get_stats() == {'words': 2, 'empty': 0, 'truncated': 0, 'rejected': 1}
+    with pytest.raises(AssertionError):
+        encoder.transform_many(full_names, policy=InputPolicy(), cache=object())
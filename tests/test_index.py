@@ -0,0 +1,84 @@
+import re
+
+import pytest
+
+from fonetika.bundle import activate_bundle, active_bundle
+from fonetika.soundex import RussianSoundex
+from fonetika.metaphone import RussianMetaphone
+from fonetika.index import PhoneticIndex, PhoneticIndexException
+from fonetika.lsh import PhoneticLSHIndex
+from fonetika.search import PhoneticSearch
+from fonetika.shard import ShardedIndex, shard_of
+
+
+registry = ['шварцнегер', 'Швардснеггер', 'Шворцинегир', 'блеснуть', 'блестнуть', 'зуд', 'суд',
+            'ненасный', 'ненастный', 'ёлочка', 'йолочка', 'счастье', 'щастье']
+
+
+def test_phonetic_index():
+    index = PhoneticIndex(RussianMetaphone(reduce_phonemes=True))
+    index.add_many(registry)
+    assert len(index) == len(registry)
+    assert index.within('шварцнегер', 0) == [(0, 'Швардснеггер'), (0, 'шварцнегер')]
+    assert index.within('Шварцнегер', 1)[-1] == (1, 'Шворцинегир')
+    assert index.nearest('сут', 2) == [(0, 'суд'), (1, 'зуд')]
+
+
+def test_sharded_index():
+    soundex = RussianSoundex(delete_first_letter=True)
+    local = PhoneticIndex(soundex)
+    local.add_many(registry)
+    with ShardedIndex(soundex, n_shards=3, prefix_len=2) as index:
+        index.add_many(registry)
+        assert len(index) == len(registry)
+        for word in registry:
+            assert index.within(word, 1) == local.within(word, 1)
+            assert index.nearest(word, 3) == local.nearest(word, 3)
+
+
+def test_shard_of():
+    assert shard_of('ШВАРЦ', 8) == shard_of('ШВАРЦ', 8)
+    assert shard_of('ШВАРЦНИГИР', 8, prefix_len=3) == shard_of('ШВАСИ', 8, prefix_len=3)
+
+
+def test_lsh_index():
+    index = PhoneticLSHIndex(RussianMetaphone(reduce_phonemes=True))
+    index.add_many(registry)
+    exact = PhoneticIndex(RussianMetaphone(reduce_phonemes=True))
+    exact.add_many(registry)
+    assert len(index) == len(registry)
+    assert index.within('шварцнегер', 0) == exact.within('шварцнегер', 0)
+    assert index.evaluate(registry, 1)['recall'] == 1.0
+    assert index.candidates(index.code('ёлочка')) == {index.code('ёлочка')}
+
+    narrow_index = PhoneticLSHIndex(RussianMetaphone(reduce_phonemes=True), bands=2, rows=4)
+    narrow_index.add_many(registry)
+    assert narrow_index.evaluate(registry, 1)['candidate_ratio'] <= index.evaluate(registry, 1)['candidate_ratio']
+
+
+def test_index_rules_version():
+    metaphone = RussianMetaphone(reduce_phonemes=True)
+    indexes = [PhoneticIndex(metaphone), PhoneticLSHIndex(metaphone), PhoneticSearch([metaphone]).indexes[0]]
+    for index in indexes:
+        index.add_many(registry)
+    empty = PhoneticIndex(metaphone)
+    dialect = active_bundle().replace(RU_REMOVE_MAP=[(re.compile(r'й', re.I), ''), (re.compile(r'[ъь]', re.I), '')])
+    with ShardedIndex(metaphone, n_shards=2) as sharded:
+        sharded.add_many(registry)
+        previous = activate_bundle(dialect)
+        try:
+            for index in indexes:
+                with pytest.raises(PhoneticIndexException):
+                    index.within('майка', 1)
+                with pytest.raises(PhoneticIndexException):
+                    index.add('майка')
+            with pytest.raises(PhoneticIndexException):
+                sharded.nearest('майка', 1)
+            empty.add_many(registry)
+            assert empty.within('йолочка', 0) == [(0, 'йолочка')]
+        finally:
+            activate_bundle(previous)
+        assert sharded.nearest('йолочка', 1) == [(0, 'йолочка')]
+    assert indexes[0].within('шварцнегер', 0) == [(0, 'Швардснеггер'), (0, 'шварцнегер')]
+    with pytest.raises(PhoneticIndexException):
+        empty.within('йолочка', 0)
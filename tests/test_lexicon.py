@@ -0,0 +1,48 @@
+import pytest
+
+from fonetika.lexicon import CodeTableException, LexiconEncoder, build_table, main
+from fonetika.soundex import RussianSoundex
+from fonetika.metaphone import RussianMetaphone
+
+
+lexicon_words = ['Иванов', 'Иван', 'Иванович', 'Петров', 'Пётр', 'Петрович', 'Сидорова', 'Мария', 'Юрьевна']
+
+
+def test_lexicon_encoder(tmp_path):
+    path = tmp_path / 'names.tbl'
+    soundex = RussianSoundex(code_vowels=True)
+    assert build_table(soundex, lexicon_words, path) == len(lexicon_words)
+
+    encoder = LexiconEncoder(soundex, path)
+    for word in lexicon_words + ['Шварцнегер', 'Ив', 'Юрьевич']:
+        assert encoder.table.get(word) == (soundex.transform(word) if word in lexicon_words else None)
+        assert encoder.transform(word) == soundex.transform(word)
+
+
+def test_lexicon_separators(tmp_path):
+    path = tmp_path / 'names.tbl'
+    soundex = RussianSoundex()
+    assert build_table(soundex, lexicon_words + ['Иван\tИванов', 'Пётр\nПетров', 'Мария\rСидорова'], path) == len(lexicon_words)
+
+    encoder = LexiconEncoder(soundex, path)
+    for word in lexicon_words:
+        assert encoder.table.get(word) == soundex.transform(word)
+    assert encoder.table.get('Пётр\nПетров') is None
+
+
+def test_stale_lexicon(tmp_path):
+    path = tmp_path / 'names.tbl'
+    build_table(RussianSoundex(), lexicon_words, path)
+
+    with pytest.raises(CodeTableException):
+        LexiconEncoder(RussianSoundex(code_vowels=True), path).transform('Иванов')
+    metaphone = RussianMetaphone()
+    assert LexiconEncoder(metaphone, path, strict=False).transform('Иванов') == metaphone.transform('Иванов')
+
+
+def test_lexicon_tool(tmp_path):
+    words, path = tmp_path / 'names.txt', tmp_path / 'names.tbl'
+    words.write_text('\n'.join(lexicon_words), encoding='utf-8')
+    main([str(words), str(path), '--encoder', 'RussianMetaphone', '--option', 'reduce_vowels=True'])
+    metaphone = RussianMetaphone(reduce_vowels=True)
+    assert LexiconEncoder(metaphone, path).transform('Петрович') == metaphone.transform('Петрович')
@@ -0,0 +1,70 @@
+import time
+
+from fonetika.cache import EncodingCache
+from fonetika.fullname import CYRILLIC, LATIN, FullNameEncoder
+from fonetika.metaphone import FinnishMetaphone
+from fonetika.metrics import DictSink, EncodingMetrics, TextSink
+from fonetika.soundex import RussianSoundex
+from fonetika.stream import StreamingEncoder
+
+
+job_words = ['Иванов', 'Петров', 'Иванов', 'Сидорова', 'Шварцнеггер', 'Иванов']
+
+
+def test_encoding_metrics():
+    sink = DictSink()
+    metrics = EncodingMetrics([sink], interval=0, sample_every=2, slowest=2)
+    soundex = RussianSoundex()
+    assert soundex.transform_many(job_words, metrics=metrics) == soundex.transform_many(job_words)
+    stats = sink.stats
+    assert stats['words'] == len(job_words)
+    assert stats['encoders'] == {'RussianSoundex': len(job_words)}
+    assert len(stats['slowest']) == 2
+    assert stats['cache_hit_ratio'] == 0.0
+
+    encoder = StreamingEncoder(soundex, metrics=metrics)
+    list(encoder.transform_stream(job_words))
+    stats = metrics.publish()
+    assert stats['words'] == 2 * len(job_words)
+    assert stats['cache_lookups'] == len(job_words)
+    assert stats['cache_hit_ratio'] == 2 / len(job_words)
+
+
+def test_encoding_metrics_slowest():
+    def transform(word):
+        if word == 'Шварцнеггер':
+            time.sleep(0.01)
+        return soundex.transform(word)
+
+    metrics = EncodingMetrics(interval=3600, sample_every=4, slowest=1)
+    soundex = RussianSoundex()
+    for word in job_words:
+        metrics.observe(soundex, word, transform)
+    stats = metrics.snapshot()
+    assert stats['slowest'][0][1:] == ('Шварцнеггер', 'RussianSoundex')
+    assert stats['mean_latency'] < stats['slowest'][0][0]
+
+
+def test_encoding_metrics_cache_and_mix(tmp_path):
+    metrics = EncodingMetrics(interval=3600)
+    soundex = RussianSoundex()
+    with EncodingCache(tmp_path / 'codes.sqlite', soundex) as cache:
+        soundex.transform_many(job_words, cache=cache, metrics=metrics)
+        soundex.transform_many(job_words, cache=cache, metrics=metrics)
+    assert metrics.snapshot()['cache_hit_ratio'] == 8 / 12
+
+    metrics.reset()
+    encoder = FullNameEncoder({CYRILLIC: soundex, LATIN: FinnishMetaphone()})
+    encoder.transform_many(['Иванов Иван', 'Järvinen Matti', 'Ahti'], metrics=metrics)
+    assert metrics.snapshot()['language_mix'] == {'RussianSoundex': 0.4, 'FinnishMetaphone': 0.6}
+
+
+def test_text_sink(tmp_path):
+    path = tmp_path / 'metrics.prom'
+    metrics = EncodingMetrics([TextSink(path)], sample_every=1)
+    RussianSoundex().transform_many(['"Иванов"'], metrics=metrics)
+    metrics.publish()
+    text = path.read_text(encoding='utf-8')
+    assert 'fonetika_words 1\n' in text
+    assert 'fonetika_encoder_words{encoder="RussianSoundex"} 1\n' in text
+    assert 'word="\\"Иванов\\""' in text
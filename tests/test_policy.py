@@ -0,0 +1,28 @@
+from fonetika.soundex import RussianSoundex, EnglishSoundex
+from fonetika.metaphone import EnglishMetaphone
+from fonetika.cache import EncodingCache
+from fonetika.policy import InputPolicy
+
+
+def test_empty_words():
+    assert RussianSoundex(cut_result=True).transform('') == ''
+    assert EnglishSoundex().transform('') == ''
+    assert EnglishMetaphone(reduce_vowels=True).transform('') == ''
+
+
+def test_input_policy():
+    soundex = RussianSoundex(delete_first_coded_letter=True)
+    policy = InputPolicy(max_length=8, empty_code='-')
+    codes = soundex.transform_many(['ёлочка!', '', None, '12 34', 'выборгский'], policy=policy)
+    assert codes == [soundex.transform('ёлочка'), '-', '-', '-', soundex.transform('выборгск')]
+
+
+def test_input_policy_rejection(tmp_path):
+    metaphone = EnglishMetaphone()
+    policy = InputPolicy(max_length=8, truncate=False, reject_code='!')
+    words = ['breakfast' * 1000, 'tea', '', 'breakfast']
+    expected = ['!', metaphone.transform('tea'), '', '!']
+    assert metaphone.transform_many(words, policy=policy) == expected
+    assert policy.get_stats() == {'words': 4, 'empty': 1, 'truncated': 0, 'rejected': 2}
+    with EncodingCache(tmp_path / 'codes.sqlite', metaphone) as cache:
+        assert metaphone.transform_many(words, policy=policy, cache=cache) == expected
@@ -0,0 +1,22 @@
+from fonetika.soundex import RussianSoundex
+from fonetika.metaphone import RussianMetaphone
+from fonetika.search import PhoneticSearch
+
+
+registry = ['шварцнегер', 'Швардснеггер', 'Шворцинегир', 'Шуберт', 'блеснуть', 'блестнуть', 'зуд', 'суд',
+            'ёлочка', 'йолочка', 'счастье', 'щастье']
+
+
+def test_search_cascade():
+    engine = PhoneticSearch([RussianSoundex(delete_first_letter=True), RussianMetaphone(reduce_phonemes=True)],
+                            registry)
+    result = engine.search('шварцнегер', limit=2)
+    assert result.stage == 'exact' and list(result.timings) == ['exact']
+    assert result.matches == [(0, 'Швардснеггер'), (0, 'шварцнегер')]
+
+    result = engine.search('Шварцнегир', limit=5)
+    assert result.stage == 'scan'
+    assert [word for _, word in result.matches] == ['Швардснеггер', 'шварцнегер', 'Шворцинегир']
+
+    result = engine.search('сут', limit=2, max_distance=0)
+    assert result.matches == [(0, 'зуд'), (0, 'суд')]
@@ -0,0 +1,23 @@
+from fonetika.soundex import RussianSoundex
+from fonetika.metaphone import RussianMetaphone
+from fonetika.stream import StreamingEncoder
+
+
+stream_words = ['ёлочка', 'йолочка', 'ёлочка', 'рентген', 'ёлочка', 'рентген']
+
+
+def test_streaming_encoder():
+    soundex = RussianSoundex(delete_first_coded_letter=True)
+    encoder = StreamingEncoder(soundex)
+    assert list(encoder.transform_stream(stream_words)) == [soundex.transform(w) for w in stream_words]
+    assert encoder.dedup_ratio() == 0.5
+
+
+def test_streaming_encoder_window():
+    metaphone = RussianMetaphone()
+    encoder = StreamingEncoder(metaphone, window_size=1)
+    for word in stream_words:
+        assert encoder.transform(word) == metaphone.transform(word)
+    stats = encoder.get_stats()
+    assert stats['window'] == 1
+    assert stats['hits'] == 0
@@ -0,0 +1,30 @@
+from fonetika.soundex import RussianSoundex
+from fonetika.metaphone import RussianMetaphone
+from fonetika.ruleset import RussianRuleSet
+from fonetika.trace import TraceEncoder, active_trace
+
+
+def test_trace_soundex():
+    soundex = RussianSoundex(delete_first_coded_letter=True)
+    trace = TraceEncoder(soundex).transform('счастье')
+    assert trace.code == soundex.transform('счастье')
+    assert active_trace() is None
+    assert any(step.stage == 'Soundex._apply_soundex_algorithm' for step in trace.steps)
+    assert [step.after for step in trace.applied_rules()] == ['счастjэ', 'щастjэ']
+
+
+def test_trace_metaphone():
+    metaphone = RussianMetaphone(reduce_phonemes=True)
+    trace = TraceEncoder(metaphone).transform('солнце')
+    assert trace.code == metaphone.transform('солнце') == 'САНЦИ'
+    assert trace.steps[0].before == 'солнце'
+    assert 'САНЦИ' in trace.format()
+
+
+def test_trace_view():
+    soundex = RussianSoundex(replace_ego_ogo_endings=True)
+    assert not hasattr(RussianSoundex._apply_soundex_algorithm, '__wrapped__')
+    trace = TraceEncoder(soundex).transform('живого')
+    assert type(soundex) is RussianSoundex and type(soundex.rule_set) is RussianRuleSet
+    assert any(step.stage == 'RussianSoundex.__replace_ego_ogo_endings' for step in trace.steps)
+    assert trace.code == soundex.transform('живого')
@@ -0,0 +1,46 @@
+import re
+
+import pytest
+
+from fonetika.bundle import activate_bundle, active_bundle
+from fonetika.index import PhoneticIndexException
+from fonetika.soundex import RussianSoundex
+from fonetika.metaphone import RussianMetaphone
+from fonetika.trie import PhoneticTrie
+
+
+customers = [('Иванов', 5), ('Иваненко', 2), ('Ивашов', 1), ('Петров', 3), ('Петрова', 4), ('Шварцнеггер', 1)]
+
+
+def test_metaphone_trie():
+    trie = PhoneticTrie(RussianMetaphone(reduce_phonemes=True))
+    trie.add_many(customers)
+    assert trie.complete('Ива') == ['Иванов', 'Иваненко', 'Ивашов']
+    assert trie.complete('ива', limit=1) == ['Иванов']
+    assert trie.complete('Петр') == ['Петрова', 'Петров']
+    assert trie.complete('Швардс') == ['Шварцнеггер']
+    assert trie.complete('Сидор') == []
+
+
+def test_soundex_trie():
+    trie = PhoneticTrie(RussianSoundex(), top_k=2)
+    trie.add_many(customers)
+    trie.add('Ивашов', 10)
+    assert trie.complete('Ива') == ['Ивашов', 'Иванов']
+    assert len(trie) == len(customers) and trie.count('Ивашов') == 11
+
+
+def test_trie_rules_version():
+    trie, empty = PhoneticTrie(RussianMetaphone()), PhoneticTrie(RussianMetaphone())
+    trie.add_many(customers)
+    previous = activate_bundle(active_bundle().replace(RU_REMOVE_MAP=[(re.compile(r'[йъь]', re.I), '')]))
+    try:
+        with pytest.raises(PhoneticIndexException):
+            trie.complete('Ива')
+        with pytest.raises(PhoneticIndexException):
+            trie.add('Иванов')
+        empty.add_many(customers)
+        assert empty.complete('Петр') == ['Петрова', 'Петров']
+    finally:
+        activate_bundle(previous)
+    assert trie.complete('Петр') == ['Петрова', 'Петров']